@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.services.task_service import TaskService
 from app.schemas.task import TaskStatus
+from pipeline.orchestrator import CANCEL_KEY
 
 router = APIRouter()
 
@@ -23,6 +24,7 @@ async def get_task_status(
 @router.post("/{task_id}/cancel")
 async def cancel_task(
     task_id: str,
+    request: Request,
     task_service: TaskService = Depends(get_task_service)
 ):
     """
@@ -31,4 +33,6 @@ async def cancel_task(
     success = await task_service.cancel_task(task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found or cannot be cancelled")
+    # The worker running the task polls this flag and stops its pipeline
+    await request.app.state.redis.set(CANCEL_KEY.format(task_id=task_id), "1", ex=3600)
     return {"message": "Task cancelled successfully"}
@@ -1,28 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from datetime import datetime
+import base64
+import binascii
 import uuid
 
-from app.schemas.video import VideoRequest, VideoResponse, VideoStatus
+from app.schemas.video import VideoRequest, VideoResponse, VideoListResponse, VideoStatus
 from app.services.video_service import VideoService
-from pipeline.orchestrator import VideoGenerationOrchestrator
+from app.worker.tasks import render_video_task
 
 router = APIRouter()
 
+# Built once at import; used to serialize list pages without FastAPI
+# re-validating every item against response_model
+VIDEO_LIST = TypeAdapter(List[VideoResponse])
 
-async def get_video_service() -> VideoService:
-    return VideoService()
+
+def _encode_cursor(video: VideoResponse) -> str:
+    """
+    Opaque cursor for the page after video: "<created_at ISO>|<id>",
+    base64url-encoded so it survives a query string unescaped
+    """
+    position = f"{video.created_at.isoformat()}|{video.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Split a cursor into its (created_at, id) keyset position"""
+    try:
+        position = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, video_id = position.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), video_id
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
-async def get_orchestrator() -> VideoGenerationOrchestrator:
-    return VideoGenerationOrchestrator()
+async def get_video_service() -> VideoService:
+    return VideoService()
 
 
 @router.post("/generate", response_model=dict)
 async def generate_video(
         request: VideoRequest,
-        background_tasks: BackgroundTasks,
-        video_service: VideoService = Depends(get_video_service),
-        orchestrator: VideoGenerationOrchestrator = Depends(get_orchestrator)
+        video_service: VideoService = Depends(get_video_service)
 ):
     """
     Generate educational video from concept query
@@ -31,18 +54,23 @@ async def generate_video(
         # Create task ID
         task_id = str(uuid.uuid4())
 
-        # Queue video generation task
-        background_tasks.add_task(
-            orchestrator.generate_video_async,
-            task_id,
-            request.concept_name,
-            request.domain,
-            request.difficulty_level
-        )
-
-        # Create task record
+        # Create task record before a worker can pick the task up
         await video_service.create_task_record(task_id, request)
 
+        # Queue video generation task on a Celery worker; the Celery task id
+        # matches task_id so status can be looked up via AsyncResult(task_id).
+        # Publishing to the broker blocks, so keep it off the event loop
+        await run_in_threadpool(
+            render_video_task.apply_async,
+            args=[
+                task_id,
+                request.concept_name,
+                request.domain,
+                request.difficulty_level.value
+            ],
+            task_id=task_id
+        )
+
         return {
             "task_id": task_id,
             "status": "queued",
@@ -67,22 +95,34 @@ async def get_video(
     return video
 
 
-@router.get("/", response_model=List[VideoResponse])
+@router.get("/", response_model=VideoListResponse)
 async def list_videos(
         domain: str = None,
-        limit: int = 20,
-        offset: int = 0,
+        cursor: Optional[str] = None,
+        limit: int = Query(20, ge=1, le=100),
         video_service: VideoService = Depends(get_video_service)
 ):
     """
-    List videos with optional filtering
+    List videos with optional filtering, newest first.
+
+    Pass the previous page's next_cursor as cursor to get the next page.
+    The cursor holds both created_at and id, so videos sharing a
+    timestamp are never skipped between pages.
     """
     videos = await video_service.list_videos(
         domain=domain,
         limit=limit,
-        offset=offset
+        cursor=_decode_cursor(cursor) if cursor else None
     )
-    return videos
+    items = VIDEO_LIST.validate_python(videos, from_attributes=True)
+    next_cursor = _encode_cursor(items[-1]) if len(items) == limit else None
+
+    # Returning the response directly skips response_model processing;
+    # response_model is kept for the OpenAPI schema
+    return ORJSONResponse({
+        "items": VIDEO_LIST.dump_python(items),
+        "next_cursor": next_cursor
+    })
 
 
 @router.delete("/{video_id}")
@@ -1,15 +1,25 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
 
+# Local-development defaults that must be overridden in production
+DEV_ONLY_DEFAULTS = {
+    "NEO4J_PASSWORD": "password",
+    "POSTGRES_PASSWORD": "password",
+    "SECRET_KEY": "your-secret-key-change-in-production",
+}
+
 
 class Settings(BaseSettings):
     # API Settings
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "AI Education Platform"
     VERSION: str = "1.0.0"
+    ENVIRONMENT: str = "development"  # or "production"
 
     # Database Settings
+    # Local dev default; production requires neo4j+s:// (TLS with system CAs)
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USERNAME: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
@@ -18,6 +28,8 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "password"
     POSTGRES_DB: str = "education_platform"
+    # Set to "transaction" behind PgBouncer/Supavisor transaction pooling
+    PG_POOLER_MODE: str = "session"
 
     REDIS_URL: str = "redis://localhost:6379"
 
@@ -37,8 +49,17 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
 
     # Manim Settings
-    MANIM_QUALITY: str = "high_quality"
+    MANIM_QUALITY: str = "high_quality"  # low_quality, medium_quality or high_quality
+    # Scratch space for scene renders. Celery workers on different hosts
+    # read each other's scenes, so this must be shared storage (e.g. an
+    # NFS or EFS mount). A tmpfs mount (e.g. /mnt/manim_scratch) avoids
+    # disk write amplification but only suits a single-host deployment
     MANIM_OUTPUT_DIR: str = "/tmp/manim_outputs"
+    MANIM_UPSCALE_RESOLUTION: Optional[str] = None  # e.g. "1920:1080"
+    # Rendered scene and LaTeX cache; keep it on disk, not on the scratch
+    # tmpfs. Least recently used entries are evicted beyond the size cap
+    MANIM_SCENE_CACHE_DIR: str = "/tmp/manim_scene_cache"
+    MANIM_SCENE_CACHE_MAX_BYTES: int = 10 * 1024 ** 3
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -48,5 +69,16 @@ class Settings(BaseSettings):
         case_sensitive = True
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def check_production_settings(self):
+        if self.ENVIRONMENT != "production":
+            return self
+        if not self.NEO4J_URI.startswith("neo4j+s://"):
+            raise ValueError("NEO4J_URI must use the neo4j+s:// scheme in production")
+        for name, default in DEV_ONLY_DEFAULTS.items():
+            if getattr(self, name) == default:
+                raise ValueError(f"{name} must be set explicitly in production")
+        return self
+
 
 settings = Settings()
@@ -1,33 +1,102 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-import uvicorn
 import asyncio
+import uuid
+import uvicorn
+import orjson
+from collections import defaultdict
 from contextlib import asynccontextmanager
+from typing import Dict, Set
+import redis.asyncio as redis
 
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.exceptions import setup_exception_handlers
-from pipeline.orchestrator import VideoGenerationOrchestrator
+from pipeline.ai_services.content_generator import get_openai_client
+from pipeline.orchestrator import get_orchestrator, TERMINAL_STATUSES
+from pipeline.knowledge_graph.graph_service import create_driver
+from pipeline.storage.postgres_client import close_all_pools, PostgresClient, TASK_UPDATES_CHANNEL
+
+
+class TaskUpdateFanout:
+    """Routes task update notifications to the WebSockets watching each task"""
+
+    def __init__(self, postgres_client: PostgresClient):
+        self.postgres_client = postgres_client
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self.subscribers[task_id].add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue):
+        self.subscribers[task_id].discard(queue)
+        if not self.subscribers[task_id]:
+            del self.subscribers[task_id]
+
+    def dispatch(self, connection, pid, channel, payload: str):
+        """asyncpg notification callback"""
+        self._publish(orjson.loads(payload)["task_id"], payload)
+
+    async def send_current(self, task_id: str):
+        """Send a task's current state to its subscribers"""
+        payload = await self.postgres_client.get_task_update(task_id)
+        if payload is not None:
+            self._publish(task_id, payload)
+
+    async def resync(self):
+        """Catch subscribers up on notifications missed while the listener was down"""
+        await asyncio.gather(*(self.send_current(task_id) for task_id in list(self.subscribers)))
+
+    def _publish(self, task_id: str, payload: str):
+        for queue in self.subscribers.get(task_id, ()):
+            queue.put_nowait(payload)
 
 # Lifespan manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting AI Education Platform...")
-    app.state.orchestrator = VideoGenerationOrchestrator()
+    # Single pooled Neo4j driver shared by every GraphService in this process
+    app.state.neo4j = await create_driver(
+        settings.NEO4J_URI, (settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD)
+    )
+    app.state.redis = redis.Redis.from_url(settings.REDIS_URL)
+    # Keep-alive HTTP/2 client reused for every LLM call
+    app.state.openai = get_openai_client(settings.OPENAI_API_KEY)
+    app.state.orchestrator = get_orchestrator(
+        neo4j_driver=app.state.neo4j,
+        openai_client=app.state.openai
+    )
     await app.state.orchestrator.initialize()
+    # Task updates are announced by Postgres as they are written; one
+    # listening connection per API instance fans them out to WebSockets
+    postgres_client = app.state.orchestrator.postgres_client
+    await postgres_client.install_task_updates_trigger()
+    app.state.task_updates = TaskUpdateFanout(postgres_client)
+    app.state.task_listener = await postgres_client.listen(
+        TASK_UPDATES_CHANNEL, app.state.task_updates.dispatch, on_reconnect=app.state.task_updates.resync
+    )
     yield
     # Shutdown
     print("🛑 Shutting down AI Education Platform...")
-    await app.state.orchestrator.cleanup()
+    await app.state.task_listener.close()
+    await app.state.orchestrator.shutdown()
+    await close_all_pools()
+    await app.state.neo4j.close()
+    await app.state.redis.aclose()
+    await app.state.openai.close()
 
 # FastAPI app initialization
 app = FastAPI(
     title="AI-Powered Educational Video Generator",
     description="Generate educational videos from knowledge graphs using AI and Manim",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -45,38 +114,42 @@ app.include_router(api_router, prefix="/api/v1")
 # Setup exception handlers
 setup_exception_handlers(app)
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[str, WebSocket] = {}
-
-    async def connect(self, websocket: WebSocket, task_id: str):
-        await websocket.accept()
-        self.active_connections[task_id] = websocket
-
-    def disconnect(self, task_id: str):
-        if task_id in self.active_connections:
-            del self.active_connections[task_id]
+@app.get("/meta/cache-stats")
+async def cache_stats():
+    """Hit rate of the content-addressed render cache"""
+    return {"render_cache": await app.state.orchestrator.render_cache_stats()}
 
-    async def send_update(self, task_id: str, message: dict):
-        if task_id in self.active_connections:
-            try:
-                await self.active_connections[task_id].send_json(message)
-            except:
-                self.disconnect(task_id)
-
-manager = ConnectionManager()
-
-# WebSocket endpoint for real-time updates
+# WebSocket endpoint for real-time updates. Progress is written to
+# Postgres by whichever worker runs the task and announced to every API
+# instance via LISTEN/NOTIFY, so any instance can serve any task
 @app.websocket("/ws/tasks/{task_id}")
 async def websocket_endpoint(websocket: WebSocket, task_id: str):
-    await manager.connect(websocket, task_id)
+    await websocket.accept()
+    try:
+        uuid.UUID(task_id)
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    updates = app.state.task_updates.subscribe(task_id)
     try:
+        # Start from the task's current state, as the last notification
+        # may have been sent before this client connected. Only this
+        # socket needs it; the others are already up to date
+        current = await app.state.task_updates.postgres_client.get_task_update(task_id)
+        if current is not None:
+            updates.put_nowait(current)
         while True:
-            # Keep connection alive
-            await asyncio.sleep(1)
+            # Payload is already JSON; forward it without re-serializing
+            payload = await updates.get()
+            await websocket.send_text(payload)
+            if orjson.loads(payload).get("status") in TERMINAL_STATUSES:
+                await websocket.close()
+                break
     except WebSocketDisconnect:
-        manager.disconnect(task_id)
+        pass
+    finally:
+        app.state.task_updates.unsubscribe(task_id, updates)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
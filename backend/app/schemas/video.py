@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Optional, List, Annotated
 from datetime import datetime
 from enum import Enum
 
@@ -10,20 +10,24 @@ class DifficultyLevel(str, Enum):
     ADVANCED = "advanced"
 
 
+# Shared config: schemas are built at import time (defer_build=False)
+# and unknown fields are dropped without raising
+SCHEMA_CONFIG = ConfigDict(from_attributes=True, defer_build=False, extra='ignore')
+
+
 class VideoRequest(BaseModel):
-    concept_name: str
+    model_config = SCHEMA_CONFIG
+
+    # Stripped and checked for emptiness in pydantic-core
+    concept_name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
     domain: str
     difficulty_level: DifficultyLevel = DifficultyLevel.INTERMEDIATE
     custom_requirements: Optional[str] = None
 
-    @validator('concept_name')
-    def concept_name_must_not_be_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Concept name cannot be empty')
-        return v.strip()
-
 
 class VideoResponse(BaseModel):
+    model_config = SCHEMA_CONFIG
+
     id: str
     concept_name: str
     domain: str
@@ -34,8 +38,12 @@ class VideoResponse(BaseModel):
     created_at: datetime
     status: str
 
-    class Config:
-        from_attributes = True
+
+class VideoListResponse(BaseModel):
+    model_config = SCHEMA_CONFIG
+
+    items: List[VideoResponse]
+    next_cursor: Optional[str] = None  # opaque; encodes created_at and id of the last item
 
 
 class VideoStatus(str, Enum):
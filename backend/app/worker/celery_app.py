@@ -0,0 +1,27 @@
+from celery import Celery
+from kombu import Exchange, Queue
+
+from app.core.config import settings
+
+
+celery_app = Celery(
+    "education_platform",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.worker.tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    # Long renders: only hand a task to a worker once it is free.
+    # Start workers with `celery -A app.worker.celery_app worker -Ofair -Q video_render`
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    # Render jobs are transient; no need to persist them across broker restarts
+    task_queues=(
+        Queue("video_render", Exchange("video_render"), routing_key="video_render", durable=False),
+    ),
+    task_default_queue="video_render",
+)
@@ -0,0 +1,233 @@
+import asyncio
+import functools
+from typing import Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.core.config import settings
+from app.worker.celery_app import celery_app
+from pipeline.knowledge_graph.graph_service import create_driver
+from pipeline.orchestrator import get_orchestrator, GenerationRequest, TaskCancelled
+from pipeline.storage.postgres_client import close_all_pools
+
+# How often finalize_video_task checks whether a task's scenes are done
+SCENE_POLL_INTERVAL = 1.0
+# Consecutive scenes rendered by one manim call on one worker, sharing
+# manim's startup cost; larger batches mean fewer starts but a longer
+# wait before the first render begins
+SCENE_BATCH_SIZE = 2
+# Scenes not finished by then are presumed lost (e.g. a message dropped
+# from the non-durable render queue) and the task is failed
+SCENE_RENDER_TIMEOUT = 30 * 60
+
+# One event loop, Neo4j driver and orchestrator per worker process, so
+# service connections are reused across tasks
+_loop = None
+_neo4j = None
+_orchestrator = None
+
+
+@worker_process_init.connect
+def init_worker(**kwargs):
+    global _loop, _neo4j, _orchestrator
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    # Graph reads happen here, so workers need the configured, pooled driver
+    _neo4j = _loop.run_until_complete(create_driver(
+        settings.NEO4J_URI, (settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD)
+    ))
+    _orchestrator = get_orchestrator(neo4j_driver=_neo4j)
+    _loop.run_until_complete(_orchestrator.initialize())
+
+
+@worker_process_shutdown.connect
+def shutdown_worker(**kwargs):
+    if _orchestrator is not None:
+        _loop.run_until_complete(_orchestrator.shutdown())
+        _loop.run_until_complete(close_all_pools())
+        _loop.run_until_complete(_neo4j.close())
+        _loop.close()
+
+
+def _run(coro):
+    if _orchestrator is None:
+        init_worker()
+    return _loop.run_until_complete(coro)
+
+
+@celery_app.task(name="render_video", acks_late=True, queue="video_render")
+def render_video_task(task_id: str, concept_name: str, domain: str, difficulty_level: str):
+    """
+    Generate content for a queued task, fanning scenes out to render
+    workers in batches of SCENE_BATCH_SIZE as soon as their slides have
+    been generated; finalize_video_task then waits for the scenes and
+    combines them.
+
+    Scenes may render on any worker host and are combined on another, so
+    MANIM_OUTPUT_DIR must be storage shared by every worker host (e.g. an
+    NFS or EFS mount); a local tmpfs only works on a single host.
+    """
+    request = GenerationRequest(task_id, concept_name, domain, difficulty_level)
+    temp_dir = _orchestrator.manim_engine.create_workspace(task_id)
+    # Runs alongside content generation; finalize_video_task continues it
+    upload_init = _loop.create_task(_orchestrator.start_upload(task_id))
+    publishes = []
+    batch = []
+
+    def publish_batch():
+        # Publishing blocks on the broker, so it runs in a thread rather
+        # than on the loop that is streaming the content
+        publishes.append(_loop.run_in_executor(None, functools.partial(
+            render_scenes_task.apply_async, args=[task_id, list(batch), temp_dir]
+        )))
+        batch.clear()
+
+    def dispatch_scene(scene_number: int, slide: dict, scene_script: dict):
+        batch.append((scene_number, slide, scene_script))
+        if len(batch) >= SCENE_BATCH_SIZE:
+            publish_batch()
+
+    try:
+        slides, script = _run(_orchestrator.run_unless_cancelled(
+            task_id, _orchestrator.prepare_content(request, on_scene=dispatch_scene)
+        ))
+        if batch:
+            publish_batch()
+        scene_ids = [result.id for result in _run(asyncio.gather(*publishes))]
+        upload_id = _run(upload_init)
+        # Identical content rendered before is copied instead
+        cache_key = _orchestrator.manim_engine.video_cache_key(slides, script)
+        video_url = _run(_orchestrator.reuse_cached_render(cache_key, request))
+        if video_url:
+            _discard_scenes(task_id, scene_ids, upload_id)
+            return _run(_orchestrator.finalize_video(video_url, request))
+        if _run(_orchestrator.is_cancelled(task_id)):
+            raise TaskCancelled(task_id)
+    except TaskCancelled:
+        _discard_scenes(task_id, _published_ids(publishes), _started_upload(upload_init))
+        _run(_orchestrator.cancel_task(task_id))
+        return None
+    except Exception as e:
+        _discard_scenes(task_id, _published_ids(publishes), _started_upload(upload_init))
+        _run(_orchestrator.fail_task(task_id, e))
+        raise
+
+    finalize_video_task.apply_async(
+        args=[scene_ids, task_id, concept_name, domain, difficulty_level, temp_dir, cache_key, upload_id],
+        # Fires if any scene or the finalization itself fails
+        link_error=mark_task_failed.si(task_id, "Video rendering failed", upload_id)
+    )
+
+
+def _published_ids(publishes: list) -> list:
+    """Wait for scene publishes still in flight and return the ids of those sent"""
+    results = _run(asyncio.gather(*publishes, return_exceptions=True))
+    return [result.id for result in results if not isinstance(result, BaseException)]
+
+
+def _started_upload(upload_init: asyncio.Task) -> Optional[str]:
+    """Id of the pre-started upload, once its initiate has finished, or None if it failed"""
+    try:
+        return _run(upload_init)
+    except Exception:
+        return None
+
+
+def _discard_scenes(task_id: str, scene_ids: list, upload_id: Optional[str]):
+    """
+    Drop scene renders and the upload that won't be used, cleaning up
+    once running scenes stop
+    """
+    if upload_id is not None:
+        _run(_orchestrator.abort_upload(task_id, upload_id))
+    if scene_ids:
+        celery_app.control.revoke(scene_ids)
+        cleanup_workspace_task.apply_async(args=[scene_ids, task_id])
+
+
+def _wait_for_scenes(task, scene_ids: list) -> Optional[list]:
+    """
+    Results of the given scene tasks; retries the calling task until all
+    are done, or returns None once SCENE_RENDER_TIMEOUT has passed
+    """
+    results = [celery_app.AsyncResult(scene_id) for scene_id in scene_ids]
+    if all(result.ready() for result in results):
+        return results
+    if task.request.retries * SCENE_POLL_INTERVAL >= SCENE_RENDER_TIMEOUT:
+        celery_app.control.revoke(scene_ids)
+        return None
+    raise task.retry(countdown=SCENE_POLL_INTERVAL, max_retries=None)
+
+
+@celery_app.task(name="render_scenes", acks_late=True, queue="video_render")
+def render_scenes_task(task_id: str, batch: list, temp_dir: str) -> list:
+    """
+    Render a batch of (scene_number, slide, script) scenes in one manim
+    call and return the paths of their video files.
+
+    The cancel flag is polled while manim runs; if it is set, manim's
+    process group is killed and finalize_video_task fails over to
+    mark_task_failed.
+    """
+    return _run(_orchestrator.run_unless_cancelled(
+        task_id, _orchestrator.manim_engine.render_scenes(batch, temp_dir)
+    ))
+
+
+@celery_app.task(name="finalize_video", bind=True, acks_late=True, queue="video_render")
+def finalize_video_task(self, scene_ids: list, task_id: str, concept_name: str, domain: str,
+                        difficulty_level: str, temp_dir: str, cache_key: str, upload_id: str) -> str:
+    """
+    Wait for a task's scenes, then combine them, stream the video to S3
+    through the upload started by render_video_task and complete the task
+    """
+    results = _wait_for_scenes(self, scene_ids)
+
+    request = GenerationRequest(task_id, concept_name, domain, difficulty_level)
+    try:
+        if results is None:
+            # Fails over to mark_task_failed like any other error
+            raise Exception("Video rendering timed out")
+        if not all(result.successful() for result in results):
+            raise Exception("Video rendering failed")
+        # Batches were published in scene order
+        scene_files = [scene_file for result in results for scene_file in result.result]
+
+        if _run(_orchestrator.is_cancelled(task_id)):
+            raise TaskCancelled(task_id)
+        video_url = _run(_orchestrator.run_unless_cancelled(task_id, _orchestrator.manim_engine.combine_scenes(
+            scene_files, temp_dir, _orchestrator.video_uploader(request, upload_id)
+        )))
+        _run(_orchestrator.store_cached_render(cache_key, request))
+        return _run(_orchestrator.finalize_video(video_url, request))
+    except TaskCancelled:
+        _run(_orchestrator.cancel_task(task_id, upload_id))
+        return None
+    finally:
+        # Scene renders are not needed once this task has run, however it ended
+        _orchestrator.manim_engine.cleanup_workspace(task_id)
+
+
+@celery_app.task(name="mark_task_failed", queue="video_render")
+def mark_task_failed(task_id: str, message: str, upload_id: str = None):
+    """
+    Errback for finalize_video_task; a scene stopped by the cancel flag
+    also ends up here
+    """
+    if _run(_orchestrator.is_cancelled(task_id)):
+        _run(_orchestrator.cancel_task(task_id, upload_id))
+    else:
+        _orchestrator.manim_engine.cleanup_workspace(task_id)
+        if upload_id is not None:
+            _run(_orchestrator.abort_upload(task_id, upload_id))
+        _run(_orchestrator.fail_task(task_id, Exception(message)))
+
+
+@celery_app.task(name="cleanup_workspace", bind=True, queue="video_render")
+def cleanup_workspace_task(self, scene_ids: list, task_id: str):
+    """
+    Remove a task's scratch directory once its discarded scenes have
+    stopped, or have been given up on
+    """
+    _wait_for_scenes(self, scene_ids)
+    _orchestrator.manim_engine.cleanup_workspace(task_id)
@@ -1,18 +1,56 @@
 import openai
+import httpx
 import json
-from typing import Dict, List, Any
+import logging
+import os
+from typing import Dict, List, Any, AsyncIterator, Tuple
 import asyncio
 
+# One client per process: keeps TLS connections to the API alive and
+# multiplexes requests over HTTP/2
+_shared_client = None
+
+
+def get_openai_client(api_key: str = None) -> openai.AsyncOpenAI:
+    """
+    Return the process-wide OpenAI client, creating it on first use with
+    api_key (OPENAI_API_KEY from the environment by default). HTTP/2
+    needs the h2 package: install httpx[http2].
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = openai.AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50),
+                timeout=httpx.Timeout(60, connect=5)
+            )
+        )
+    return _shared_client
+
+
+# Decodes one scene at a time out of a partially streamed response
+_scene_decoder = json.JSONDecoder()
+
 
 class ContentGenerator:
-    def __init__(self):
-        self.openai_client = None
-        self.api_key = "your-openai-api-key"
+    def __init__(self, openai_client: openai.AsyncOpenAI = None):
+        self.openai_client = openai_client
+        self.logger = logging.getLogger(__name__)
 
     async def initialize(self):
         """Initialize AI service clients"""
-        openai.api_key = self.api_key
-        self.openai_client = openai.AsyncOpenAI()
+        if self.openai_client is None:
+            self.openai_client = get_openai_client()
+
+    async def embed(self, text: str) -> List[float]:
+        """Return the embedding vector for a piece of text"""
+        response = await self.openai_client.embeddings.create(
+            model="text-embedding-3-small",
+            input=text
+        )
+        return response.data[0].embedding
 
     async def generate_educational_content(
             self,
@@ -23,11 +61,105 @@ class ContentGenerator:
         """
         Generate educational slides and script from concept data
         """
+        slides, script = [], []
+        async for slide, scene_script in self.stream_educational_content(concept_data, difficulty_level, domain):
+            slides.append(slide)
+            script.append(scene_script)
+
+        return {
+            "slides": slides,
+            "script": script
+        }
+
+    async def stream_educational_content(
+            self,
+            concept_data: Dict[str, Any],
+            difficulty_level: str,
+            domain: str
+    ) -> AsyncIterator[Tuple[Dict, Dict]]:
+        """
+        Stream (slide, script) pairs as soon as the model finishes each one
+        """
         prompt = self._build_educational_prompt(concept_data, difficulty_level, domain)
 
         try:
             response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
+                # JSON mode needs a GPT-4 Turbo or later model
+                model="gpt-4-turbo",
                 messages=[
                     {"role": "system",
-                     "content": "You are an expert educational content creator specializing in creating engaging technical presentations
\ No newline at end of file
+                     "content": "You are an expert educational content creator specializing in creating engaging technical presentations."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                response_format={"type": "json_object"},
+                stream=True
+            )
+
+            # The response is a single {"scenes": [...]} object; each entry
+            # of the array is yielded as soon as it has been streamed in full
+            buffer = ""
+            in_scenes = False
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                buffer += chunk.choices[0].delta.content or ""
+                if not in_scenes:
+                    if "[" not in buffer:
+                        continue
+                    buffer = buffer.split("[", 1)[1]
+                    in_scenes = True
+                scenes, buffer = self._decode_scenes(buffer)
+                for scene in scenes:
+                    yield scene
+
+            # Anything but the end of the array was never decoded
+            if buffer.strip() and not (in_scenes and buffer.startswith("]")):
+                self.logger.warning("Discarding undecodable generated content: %.200s", buffer)
+
+        except Exception as e:
+            raise Exception(f"Content generation failed: {str(e)}")
+
+    def _decode_scenes(self, buffer: str) -> Tuple[List[Tuple[Dict, Dict]], str]:
+        """
+        Decode the complete scenes at the front of buffer, which holds the
+        rest of the scenes array. Returns them with the undecoded remainder,
+        which is kept until more of the response arrives.
+        """
+        scenes = []
+        while True:
+            buffer = buffer.lstrip(" \t\r\n,")
+            if not buffer.startswith("{"):
+                return scenes, buffer
+            try:
+                entry, end = _scene_decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Most likely an entry still being streamed
+                return scenes, buffer
+            buffer = buffer[end:]
+            try:
+                scenes.append((entry["slide"], entry["script"]))
+            except (KeyError, TypeError):
+                self.logger.warning("Skipping malformed scene: %.200s", json.dumps(entry))
+
+    def _build_educational_prompt(self, concept_data: Dict[str, Any], difficulty_level: str, domain: str) -> str:
+        """Build the generation prompt from concept data"""
+        concept = concept_data.get("concept", {})
+        prerequisites = [p.get("name", "") for p in concept_data.get("prerequisites", [])]
+        examples = [e.get("description", e.get("name", "")) for e in concept_data.get("examples", [])]
+        related = [r.get("name", "") for r in concept_data.get("related_concepts", [])]
+
+        return f"""
+Create an educational presentation about "{concept.get('name', '')}" in the {domain} domain
+for a {difficulty_level} audience.
+
+Concept summary: {concept.get('summary', concept.get('description', ''))}
+Prerequisites: {", ".join(prerequisites) or "None"}
+Examples: {", ".join(examples) or "None"}
+Related concepts: {", ".join(related) or "None"}
+
+Respond in JSON only: a single object whose "scenes" array holds one entry
+per slide, in presentation order, each with this shape:
+{{"slide": {{"slide_number": 1, "title": "Slide title", "content": ["Bullet point", "..."], "code_example": "Optional code snippet", "animation_type": "fade_in | write_gradually | highlight | transform"}}, "script": {{"slide_number": 1, "narration": "What the narrator says for this slide", "duration": 20}}}}
+i.e. {{"scenes": [<entry>, <entry>, ...]}}
+"""
@@ -1,135 +1,59 @@
 import os
+import signal
 import asyncio
 import uuid
 import tempfile
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Callable, Awaitable, Optional
 import subprocess
 import shutil
+import hashlib
+import json
+from string import Template
 
 
-class ManimEngine:
-    def __init__(self):
-        self.output_dir = "/tmp/manim_outputs"
-        self.quality = "high_quality"
-        self.scene_templates = {}
-
-    async def initialize(self):
-        """Initialize Manim engine"""
-        os.makedirs(self.output_dir, exist_ok=True)
-        self._load_scene_templates()
-
-    def _load_scene_templates(self):
-        """Load predefined Manim scene templates"""
-        self.scene_templates = {
-            "intro": self._generate_intro_scene,
-            "text": self._generate_text_scene,
-            "code": self._generate_code_scene,
-            "math": self._generate_math_scene,
-            "diagram": self._generate_diagram_scene,
-            "conclusion": self._generate_conclusion_scene
-        }
-
-    async def generate_video(self, slides: List[Dict], script: List[Dict], task_id: str) -> str:
-        """
-        Generate complete educational video from slides and script
-        """
-        scene_files = []
-        temp_dir = os.path.join(self.output_dir, task_id)
-        os.makedirs(temp_dir, exist_ok=True)
-
-        try:
-            # Generate individual scenes
-            for i, slide in enumerate(slides):
-                scene_file = await self._create_scene(slide, script[i], i, temp_dir)
-                scene_files.append(scene_file)
-
-            # Combine all scenes into final video
-            final_video = await self._combine_scenes(scene_files, temp_dir)
-
-            return final_video
-
-        except Exception as e:
-            # Cleanup on error
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            raise Exception(f"Video generation failed: {str(e)}")
-
-    async def _create_scene(self, slide: Dict, script: Dict, scene_number: int, temp_dir: str) -> str:
-        """Create individual Manim scene"""
-        scene_type = self._determine_scene_type(slide)
-        scene_code = self._generate_scene_code(slide, script, scene_number, scene_type)
-
-        # Write scene code to file
-        scene_file = os.path.join(temp_dir, f"scene_{scene_number}.py")
-        with open(scene_file, 'w') as f:
-            f.write(scene_code)
-
-        # Render scene
-        output_file = await self._render_scene(scene_file, scene_number, temp_dir)
-        return output_file
-
-    def _determine_scene_type(self, slide: Dict) -> str:
-        """Determine appropriate scene type based on slide content"""
-        title = slide.get("title", "").lower()
-        content = " ".join(slide.get("content", [])).lower()
-
-        if slide.get("code_example") or "code" in content or "algorithm" in content:
-            return "code"
-        elif "formula" in content or "equation" in content or "theorem" in content:
-            return "math"
-        elif slide.get("slide_number") == 1:
-            return "intro"
-        elif slide.get("slide_number") >= 8:  # Assuming last slides are conclusions
-            return "conclusion"
-        elif "diagram" in content or "graph" in content or "tree" in content:
-            return "diagram"
-        else:
-            return "text"
-
-    def _generate_scene_code(self, slide: Dict, script: Dict, scene_number: int, scene_type: str) -> str:
-        """Generate Manim Python code for the scene"""
-        base_code = f'''
+# Scene code templates, compiled once at import. Slide values are
+# substituted as Python literals (repr) so quotes or braces in
+# user-supplied text can't break or inject into the generated code.
+SCENE_TEMPLATE = Template('''
 from manim import *
 import numpy as np
 
-class EducationalScene{scene_number}(Scene):
+# Shared across renders so each LaTeX formula is compiled only once
+config.tex_dir = ${tex_dir}
+
+class EducationalScene${scene_number}(Scene):
     def construct(self):
         # Scene configuration
         self.camera.background_color = WHITE
 
         # Title
-        title = Text("{slide['title']}", 
+        title = Text(${title}, 
                     font_size=48, 
                     color=BLUE_D, 
                     font="Arial Bold")
         title.to_edge(UP, buff=0.5)
 
         # Content based on scene type
-        {self._generate_content_code(slide, script, scene_type)}
+        ${content_code}
 
         # Animations
         self.play(FadeIn(title, shift=DOWN))
         self.wait(0.5)
 
-        {self._generate_animation_code(slide, scene_type)}
+        ${animation_code}
 
         # Hold final frame
         self.wait(2)
-'''
-        return base_code
+''')
 
-    def _generate_content_code(self, slide: Dict, script: Dict, scene_type: str) -> str:
-        """Generate content-specific Manim code"""
-        content = slide.get("content", [])
-
-        if scene_type == "text":
-            return f'''
+CONTENT_TEMPLATES = {
+    "text": Template('''
         # Text content
         content_items = VGroup()
-        content_texts = {content}
+        content_texts = ${content}
 
         for i, text in enumerate(content_texts):
-            item = Text(f"• {{text}}", 
+            item = Text(f"• {text}", 
                        font_size=32, 
                        color=BLACK,
                        font="Arial")
@@ -138,16 +62,12 @@ class EducationalScene{scene_number}(Scene):
         content_items.arrange(DOWN, aligned_edge=LEFT, buff=0.3)
         content_items.next_to(title, DOWN, buff=1)
         content_items.to_edge(LEFT, buff=1)
-'''
+'''),
 
-        elif scene_type == "code":
-            code_example = slide.get("code_example", "# Sample code")
-            return f'''
+    "code": Template('''
         # Code content
         code_block = Code(
-            code="""
-{code_example}
-            """,
+            code=${code_example},
             tab_width=4,
             background="window",
             language="python",
@@ -161,53 +81,49 @@ class EducationalScene{scene_number}(Scene):
                           font_size=28,
                           color=BLUE_D)
         explanation.next_to(code_block, DOWN, buff=0.5)
-'''
+'''),
 
-        elif scene_type == "math":
-            return f'''
+    "math": Template('''
         # Mathematical content
         formula = MathTex(
-            r"\\text{{Mathematical Concept}}",
+            r"\\text{Mathematical Concept}",
             font_size=36,
             color=BLACK
         )
         formula.next_to(title, DOWN, buff=1)
 
         explanation = VGroup()
-        for item in {content}:
-            text = Text(f"• {{item}}", font_size=28, color=BLACK)
+        for item in ${content}:
+            text = Text(f"• {item}", font_size=28, color=BLACK)
             explanation.add(text)
         explanation.arrange(DOWN, aligned_edge=LEFT, buff=0.2)
         explanation.next_to(formula, DOWN, buff=1)
-'''
+'''),
 
-        return f'''
+    "default": Template('''
         # Default content
         content_group = VGroup()
-        for item in {content}:
-            text = Text(f"• {{item}}", font_size=30, color=BLACK)
+        for item in ${content}:
+            text = Text(f"• {item}", font_size=30, color=BLACK)
             content_group.add(text)
         content_group.arrange(DOWN, aligned_edge=LEFT, buff=0.3)
         content_group.next_to(title, DOWN, buff=1)
-'''
-
-    def _generate_animation_code(self, slide: Dict, scene_type: str) -> str:
-        """Generate animation sequence code"""
-        animation_type = slide.get("animation_type", "fade_in")
+''')
+}
 
-        animations = {
-            "fade_in": """
+ANIMATIONS = {
+    "fade_in": """
         self.play(FadeIn(content_items, shift=UP))
         for item in content_items:
             self.play(Indicate(item, color=BLUE))
             self.wait(0.3)""",
 
-            "write_gradually": """
+    "write_gradually": """
         for item in content_items:
             self.play(Write(item))
             self.wait(0.5)""",
 
-            "highlight": """
+    "highlight": """
         self.play(FadeIn(content_items))
         self.wait(1)
         for item in content_items:
@@ -221,87 +137,410 @@ class EducationalScene{scene_number}(Scene):
                 run_time=0.3
             )""",
 
-            "transform": """
+    "transform": """
         temp_group = content_items.copy()
         temp_group.shift(LEFT * 3)
         self.play(Transform(temp_group, content_items))
         self.wait(1)"""
-        }
+}
+
+# Manim quality presets: MANIM_QUALITY value -> (CLI flag, output subdirectory)
+QUALITY_PRESETS = {
+    "low_quality": ("-ql", "480p15"),
+    "medium_quality": ("-qm", "720p30"),
+    "high_quality": ("-qh", "1080p60"),
+}
+
+# Rendered scenes and compiled LaTeX are cached on disk up to this many
+# bytes, evicting the least recently used first
+DEFAULT_SCENE_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+
+class ManimEngine:
+    def __init__(self):
+        self.output_dir = os.getenv("MANIM_OUTPUT_DIR", "/tmp/manim_outputs")
+        # Kept apart from the scratch space, which may be a tmpfs: the
+        # cache is long-lived and belongs on disk
+        self.cache_dir = os.getenv("MANIM_SCENE_CACHE_DIR", "/tmp/manim_scene_cache")
+        self.cache_max_bytes = int(os.getenv("MANIM_SCENE_CACHE_MAX_BYTES", DEFAULT_SCENE_CACHE_MAX_BYTES))
+        self.tex_cache_dir = os.path.join(self.cache_dir, "tex")
+        self.quality = os.getenv("MANIM_QUALITY", "high_quality")
+        # Optional "W:H" to upscale lower-quality renders, e.g. render
+        # medium_quality and upscale to 1920:1080
+        self.upscale_resolution = os.getenv("MANIM_UPSCALE_RESOLUTION")
+        self.scene_templates = {}
 
-        return animations.get(animation_type, animations["fade_in"])
+    async def initialize(self):
+        """Initialize Manim engine"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        os.makedirs(self.tex_cache_dir, exist_ok=True)
+        self._load_scene_templates()
 
-    async def _render_scene(self, scene_file: str, scene_number: int, temp_dir: str) -> str:
-        """Render individual scene using Manim"""
-        class_name = f"EducationalScene{scene_number}"
+    def _load_scene_templates(self):
+        """Load predefined Manim scene templates"""
+        self.scene_templates = CONTENT_TEMPLATES
+
+    def create_workspace(self, task_id: str) -> str:
+        """Create the scratch directory for a task's scenes"""
+        temp_dir = os.path.join(self.output_dir, task_id)
+        os.makedirs(temp_dir, exist_ok=True)
+        return temp_dir
+
+    def cleanup_workspace(self, task_id: str):
+        """Remove a task's scratch directory"""
+        shutil.rmtree(os.path.join(self.output_dir, task_id), ignore_errors=True)
+
+    async def render_scenes(self, batch: List[Tuple[int, Dict, Dict]], temp_dir: str) -> List[str]:
+        """
+        Render a batch of (scene_number, slide, script) scenes in one manim
+        call, sharing its startup cost; used when scenes are fanned out to
+        workers
+        """
+        return await self._create_scenes(batch, temp_dir)
+
+    async def combine_scenes(
+            self,
+            scene_files: List[str],
+            temp_dir: str,
+            consume_stream: Callable[[asyncio.StreamReader], Awaitable[Any]] = None
+    ) -> Any:
+        """Combine rendered scenes into the final video, on disk or streamed"""
+        if consume_stream:
+            return await self._stream_combined_scenes(scene_files, consume_stream)
+        return await self._combine_scenes(scene_files, temp_dir)
+
+    async def _create_scenes(self, batch: List[Tuple[int, Dict, Dict]], temp_dir: str) -> List[str]:
+        """
+        Create a batch of (scene_number, slide, script) Manim scenes,
+        rendering all uncached ones from a single file in one manim call
+        """
+        output_files = [None] * len(batch)
+        to_render = []
+
+        for i, (scene_number, slide, script) in enumerate(batch):
+            scene_type = self._determine_scene_type(slide)
+
+            # Reuse a previously rendered scene with identical inputs
+            cache_key = self._scene_cache_key(slide, script, scene_type)
+            cached_file = os.path.join(self.cache_dir, f"{cache_key}.mp4")
+            output_file = self._copy_cached_scene(cached_file, os.path.join(temp_dir, f"scene_{scene_number}.mp4"))
+            if output_file:
+                output_files[i] = output_file
+            else:
+                scene_code = self._generate_scene_code(slide, script, scene_number, scene_type)
+                to_render.append((i, scene_number, scene_code, cached_file))
+
+        if to_render:
+            # Write all scene classes to one file
+            scene_file = os.path.join(temp_dir, f"scenes_{to_render[0][1]}.py")
+            with open(scene_file, 'w') as f:
+                f.write("\n".join(scene_code for _, _, scene_code, _ in to_render))
+
+            # Render scenes
+            rendered = await self._render_scenes(
+                scene_file, [scene_number for _, scene_number, _, _ in to_render], temp_dir
+            )
+            for (i, _, _, cached_file), output_file in zip(to_render, rendered):
+                self._store_cached_scene(output_file, cached_file)
+                output_files[i] = output_file
+            self._evict_scene_cache()
+
+        return output_files
+
+    def video_cache_key(self, slides: List[Dict], script: List[Dict]) -> str:
+        """Hash the inputs that determine a whole rendered video"""
+        payload = json.dumps({
+            "slides": slides,
+            "script": script,
+            "quality": self.quality,
+            "upscale": self.upscale_resolution
+        }, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode()).hexdigest()
+
+    def _scene_cache_key(self, slide: Dict, script: Dict, scene_type: str) -> str:
+        """Hash the inputs that determine a rendered scene"""
+        payload = json.dumps({
+            "slide": slide,
+            "script": script,
+            "type": scene_type,
+            "anim": slide.get("animation_type"),
+            "quality": self.quality,
+            "upscale": self.upscale_resolution
+        }, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode()).hexdigest()
+
+    def _copy_cached_scene(self, cached_file: str, output_file: str) -> Optional[str]:
+        """Copy a cached scene into the workspace, or return None on a miss"""
+        try:
+            shutil.copy(cached_file, output_file)
+            # Mark it recently used so eviction keeps it
+            os.utime(cached_file)
+        except FileNotFoundError:
+            # Not cached, or evicted by another worker
+            return None
+        return output_file
+
+    def _evict_scene_cache(self):
+        """Remove least recently used scenes and LaTeX output until the
+        cache fits its size cap"""
+        entries = []
+        total = 0
+        for directory, suffix in ((self.cache_dir, ".mp4"), (self.tex_cache_dir, "")):
+            try:
+                scan = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with scan:
+                for entry in scan:
+                    if not entry.name.endswith(suffix) or entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    # Manim reads cached LaTeX without touching it, so
+                    # fall back on the access time where it is newer
+                    last_used = max(stat.st_mtime, stat.st_atime)
+                    entries.append((last_used, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.cache_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _store_cached_scene(self, output_file: str, cached_file: str):
+        """Atomically publish a rendered scene into the cache"""
+        tmp_file = f"{cached_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copy(output_file, tmp_file)
+            os.replace(tmp_file, cached_file)
+        except OSError:
+            # Caching is best-effort; never fail a render because of it
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _determine_scene_type(self, slide: Dict) -> str:
+        """Determine appropriate scene type based on slide content"""
+        title = slide.get("title", "").lower()
+        content = " ".join(slide.get("content", [])).lower()
+
+        if slide.get("code_example") or "code" in content or "algorithm" in content:
+            return "code"
+        elif "formula" in content or "equation" in content or "theorem" in content:
+            return "math"
+        elif slide.get("slide_number") == 1:
+            return "intro"
+        elif slide.get("slide_number") >= 8:  # Assuming last slides are conclusions
+            return "conclusion"
+        elif "diagram" in content or "graph" in content or "tree" in content:
+            return "diagram"
+        else:
+            return "text"
+
+    def _generate_scene_code(self, slide: Dict, script: Dict, scene_number: int, scene_type: str) -> str:
+        """Generate Manim Python code for the scene"""
+        content_template = self.scene_templates.get(scene_type, self.scene_templates["default"])
+        content_code = content_template.substitute(
+            content=repr(slide.get("content", [])),
+            code_example=repr(slide.get("code_example") or "# Sample code")
+        )
+        animation_code = ANIMATIONS.get(slide.get("animation_type", "fade_in"), ANIMATIONS["fade_in"])
+
+        return SCENE_TEMPLATE.substitute(
+            scene_number=scene_number,
+            tex_dir=repr(self.tex_cache_dir),
+            title=repr(slide.get("title", "")),
+            content_code=content_code,
+            animation_code=animation_code
+        )
+
+    async def _render_scenes(self, scene_file: str, scene_numbers: List[int], temp_dir: str) -> List[str]:
+        """Render the given scenes of a scene file in one Manim invocation"""
+        class_names = [f"EducationalScene{scene_number}" for scene_number in scene_numbers]
+        module_name = os.path.splitext(os.path.basename(scene_file))[0]
+        quality_flag, quality_dir = QUALITY_PRESETS.get(self.quality, QUALITY_PRESETS["high_quality"])
+        # Separate media dir per batch so concurrent renders don't contend
+        # on manim's shared cache files
+        media_dir = os.path.join(temp_dir, f"s{scene_numbers[0]}")
 
         cmd = [
             "manim",
             scene_file,
-            class_name,
-            "-q", "high_quality",
-            "--output_file", f"scene_{scene_number}",
-            "--media_dir", temp_dir
+            *class_names,
+            quality_flag,
+            "--media_dir", media_dir
         ]
 
         try:
             # Run Manim command
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
+            returncode, stdout, stderr = await self._run_subprocess(cmd)
 
-            if process.returncode != 0:
+            if returncode != 0:
                 raise Exception(f"Manim rendering failed: {stderr.decode()}")
 
-            # Find output file
-            video_file = os.path.join(temp_dir, "videos", f"{class_name}", "1080p60", f"scene_{scene_number}.mp4")
+            video_files = []
+            for class_name in class_names:
+                # Find output file (manim nests it under the scene module name)
+                video_file = os.path.join(media_dir, "videos", module_name, quality_dir, f"{class_name}.mp4")
 
-            if not os.path.exists(video_file):
-                raise Exception(f"Output video file not found: {video_file}")
+                if not os.path.exists(video_file):
+                    raise Exception(f"Output video file not found: {video_file}")
 
-            return video_file
+                if self.upscale_resolution:
+                    video_file = await self._upscale_scene(video_file)
+
+                video_files.append(video_file)
+
+            return video_files
 
         except Exception as e:
             raise Exception(f"Scene rendering failed: {str(e)}")
 
+    async def _run_subprocess(self, cmd: List[str], input: bytes = None):
+        """
+        Run a command in its own process group so cancelling the awaiting
+        task terminates the whole manim/ffmpeg process tree
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if input is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+
+        try:
+            stdout, stderr = await process.communicate(input=input)
+        except asyncio.CancelledError:
+            self._kill_process_group(process)
+            raise
+
+        return process.returncode, stdout, stderr
+
+    def _kill_process_group(self, process: asyncio.subprocess.Process):
+        """Terminate a subprocess started in its own session, with its children"""
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    async def _upscale_scene(self, video_file: str) -> str:
+        """Upscale a rendered scene to the configured resolution"""
+        output_file = video_file.replace(".mp4", "_upscaled.mp4")
+
+        cmd = [
+            "ffmpeg",
+            "-i", video_file,
+            "-vf", f"scale={self.upscale_resolution}:flags=lanczos",
+            "-c:v", "libx264",
+            "-preset", "veryfast",
+            "-c:a", "copy",
+            output_file,
+            "-y"
+        ]
+
+        returncode, stdout, stderr = await self._run_subprocess(cmd)
+
+        if returncode != 0:
+            raise Exception(f"Upscaling failed: {stderr.decode()}")
+
+        return output_file
+
     async def _combine_scenes(self, scene_files: List[str], temp_dir: str) -> str:
         """Combine multiple scenes into final video using FFmpeg"""
-        # Create list file for FFmpeg
-        list_file = os.path.join(temp_dir, "video_list.txt")
-        with open(list_file, 'w') as f:
-            for scene_file in scene_files:
-                f.write(f"file '{scene_file}'\n")
+        # Concat list is piped to FFmpeg's stdin instead of a list file
+        concat_list = "".join(f"file '{scene_file}'\n" for scene_file in scene_files)
 
         # Output file path
         output_file = os.path.join(temp_dir, "final_video.mp4")
 
-        # FFmpeg command to concatenate videos
+        # FFmpeg command to concatenate videos. All scenes share codec
+        # parameters, so streams are copied without re-encoding
         cmd = [
             "ffmpeg",
             "-f", "concat",
             "-safe", "0",
-            "-i", list_file,
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
             "-c", "copy",
             output_file,
             "-y"  # Overwrite output file
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
+            returncode, stdout, stderr = await self._run_subprocess(cmd, input=concat_list.encode())
 
-            if process.returncode != 0:
+            if returncode != 0:
                 raise Exception(f"Video combination failed: {stderr.decode()}")
 
             return output_file
 
         except Exception as e:
-            raise Exception(f"Video combination failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Video combination failed: {str(e)}")
+
+    async def _stream_combined_scenes(
+            self,
+            scene_files: List[str],
+            consume_stream: Callable[[asyncio.StreamReader], Awaitable[Any]]
+    ) -> Any:
+        """
+        Combine scenes with FFmpeg and hand its output to consume_stream
+        while it is produced, without writing the final video to disk.
+
+        consume_stream returns a pending upload, which is only completed
+        once FFmpeg has exited cleanly, so a truncated video is never
+        published; otherwise it is aborted.
+        """
+        concat_list = "".join(f"file '{scene_file}'\n" for scene_file in scene_files)
+
+        # Fragmented MP4 can be written to a pipe: no seeking back to
+        # rewrite the moov atom at the end
+        cmd = [
+            "ffmpeg",
+            "-f", "concat",
+            "-safe", "0",
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
+            "-c", "copy",
+            "-f", "mp4",
+            "-movflags", "frag_keyframe+empty_moov",
+            "pipe:1"
+        ]
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+        process.stdin.write(concat_list.encode())
+        process.stdin.close()
+        # Drain stderr alongside stdout so FFmpeg never blocks on it
+        stderr_reader = asyncio.create_task(process.stderr.read())
+
+        pending = None
+        try:
+            pending = await consume_stream(process.stdout)
+            returncode = await process.wait()
+        except BaseException:
+            self._kill_process_group(process)
+            stderr_reader.cancel()
+            if pending is not None:
+                await pending.abort()
+            raise
+
+        stderr = await stderr_reader
+        if returncode != 0:
+            await pending.abort()
+            raise Exception(f"Video combination failed: {stderr.decode()}")
+
+        return await pending.complete()
\ No newline at end of file
@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+
+# name -> (coroutine function, names of the nodes it depends on)
+DagNodes = Dict[str, Tuple[Callable[..., Awaitable[Any]], Sequence[str]]]
+
+
+async def run_dag(nodes: DagNodes) -> Dict[str, Any]:
+    """
+    Run async steps as soon as their dependencies have finished.
+
+    Each node's function is called with its dependencies' results as
+    keyword arguments named after those dependencies. If any node fails,
+    the others are cancelled and the error is raised.
+    """
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def _run_node(name: str):
+        fn, deps = nodes[name]
+        results = await asyncio.gather(*(tasks[dep] for dep in deps))
+        return await fn(**dict(zip(deps, results)))
+
+    for name in nodes:
+        tasks[name] = asyncio.create_task(_run_node(name))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    return {name: task.result() for name, task in tasks.items()}
@@ -1,17 +1,60 @@
-from neo4j import AsyncGraphDatabase
-from typing import Dict, List, Any, Optional
-import json
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+from typing import Dict, List, Any, Optional, Tuple
+
+from pipeline.storage.cache_service import CacheService
+
+
+# Driver-level connection pool settings; the driver is meant to be
+# created once per process and shared
+POOL_SETTINGS = {
+    "max_connection_pool_size": 50,
+    "connection_acquisition_timeout": 5.0,
+    "connection_timeout": 5.0,
+    "keep_alive": True,
+}
+
+
+
+async def create_driver(uri: str, auth: Tuple[str, str]):
+    """
+    Build the process-wide pooled driver and open its first connection,
+    so the first query doesn't pay the Bolt handshake
+    """
+    driver = AsyncGraphDatabase.driver(uri, auth=auth, **POOL_SETTINGS)
+    async with driver.session() as session:
+        await session.run("RETURN 1")
+    return driver
+
+
+# Cached concept subgraphs are evicted when the concept's relationships
+# change (see invalidate_concept); the TTL is only a safety net
+CONCEPT_CACHE_TTL = 24 * 3600
+# Individual nodes (L1), keyed by element id, are shared by every cached
+# subgraph (L2) that references them, so updating a node only evicts its
+# own entry (see invalidate_entity)
+ENTITY_CACHE_TTL = 24 * 3600
+# Subgraph fields that hold lists of nodes, cached as element ids
+ENTITY_LIST_FIELDS = ("prerequisites", "examples", "related_concepts")
+# Channel on which concept updates are announced to other caches
+CONCEPT_INVALIDATION_CHANNEL = "concept_invalidations"
 
 
 class GraphService:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, cache_service: CacheService, driver=None):
+        # A shared driver (e.g. app.state.neo4j) is reused as-is and
+        # owned by whoever created it
+        self.driver = driver
+        self._owns_driver = driver is None
         self.uri = "bolt://localhost:7687"
         self.auth = ("neo4j", "password")
+        # The process-wide cache, initialized and closed by its owner;
+        # this is the only cache of concept knowledge
+        self.cache = cache_service
 
     async def initialize(self):
         """Initialize Neo4j connection"""
-        self.driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth)
+        if self.driver is None:
+            self.driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth, **POOL_SETTINGS)
         await self._verify_connection()
 
     async def _verify_connection(self):
@@ -26,6 +69,121 @@ class GraphService:
         """
         Retrieve concept with related information from knowledge graph
         """
+        concept_data = await self.get_cached_concept(concept_name, domain)
+        if concept_data is not None:
+            return concept_data
+
+        concept_data = await self._query_concept_with_context(concept_name, domain)
+
+        await self._set_entities([
+            concept_data["concept"],
+            *(entity for field in ENTITY_LIST_FIELDS for entity in concept_data[field])
+        ])
+        subgraph = {
+            **concept_data,
+            "concept": concept_data["concept"]["id"],
+            **{field: [entity["id"] for entity in concept_data[field]] for field in ENTITY_LIST_FIELDS}
+        }
+        await self.cache.set(self._concept_cache_key(concept_name, domain), subgraph, ttl=CONCEPT_CACHE_TTL)
+        return concept_data
+
+    async def get_cached_concept(self, concept_name: str, domain: str) -> Optional[Dict[str, Any]]:
+        """Return a concept's cached subgraph, or None without querying the graph"""
+        cached = await self.cache.get(self._concept_cache_key(concept_name, domain))
+        if not cached:
+            return None
+        # Nodes are cached by element id; resolve them from L1
+        return await self._resolve_subgraph(cached)
+
+    async def _resolve_subgraph(self, subgraph: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Replace a cached subgraph's element ids with their nodes, or None if the concept is gone"""
+        entities = await self._get_entities([
+            subgraph["concept"],
+            *(element_id for field in ENTITY_LIST_FIELDS for element_id in subgraph[field])
+        ])
+        if subgraph["concept"] not in entities:
+            return None
+
+        return {
+            **subgraph,
+            "concept": entities[subgraph["concept"]],
+            **{
+                field: [entities[element_id] for element_id in subgraph[field] if element_id in entities]
+                for field in ENTITY_LIST_FIELDS
+            }
+        }
+
+    async def _get_entities(self, element_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve nodes from the entity cache by element id, querying only misses"""
+        if not element_ids:
+            return {}
+
+        cached = await self.cache.get_many([self._entity_cache_key(element_id) for element_id in element_ids])
+        entities = {
+            element_id: entity
+            for element_id, entity in zip(element_ids, cached) if entity
+        }
+
+        missing = [element_id for element_id in element_ids if element_id not in entities]
+        if missing:
+            fetched = await self._query_entities(missing)
+            await self._set_entities(fetched)
+            entities.update((entity["id"], entity) for entity in fetched)
+
+        return entities
+
+    async def _set_entities(self, entities: List[Dict[str, Any]]):
+        """Populate the entity cache from freshly queried nodes"""
+        await self.cache.set_many(
+            {self._entity_cache_key(entity["id"]): entity for entity in entities}, ttl=ENTITY_CACHE_TTL
+        )
+
+    async def invalidate_entity(self, element_id: str):
+        """
+        Drop the cached copy of a node after its properties are updated.
+        Every cached subgraph that references it picks up the change.
+        """
+        await self.cache.delete(self._entity_cache_key(element_id))
+
+    async def invalidate_concept(self, concept_name: str, domain: str):
+        """
+        Drop a concept's cached subgraph after its relationships change,
+        along with the concept node itself. Call this from any code that
+        mutates a concept.
+        """
+        keys = [self._concept_cache_key(concept_name, domain)]
+        cached = await self.cache.get(keys[0])
+        if cached:
+            keys.append(self._entity_cache_key(cached["concept"]))
+        await self.cache.delete(*keys)
+        await self.cache.publish(
+            CONCEPT_INVALIDATION_CHANNEL,
+            {"concept_name": concept_name, "domain": domain}
+        )
+
+    def _concept_cache_key(self, concept_name: str, domain: str) -> str:
+        return f"concept:{domain}:{concept_name}"
+
+    def _entity_cache_key(self, element_id: str) -> str:
+        return f"entity:{element_id}"
+
+    async def _query_entities(self, element_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch nodes by element id"""
+        query = """
+        MATCH (n)
+        WHERE elementId(n) IN $element_ids
+        RETURN n {.*, id: elementId(n)} as entity
+        """
+
+        async def _read(tx):
+            result = await tx.run(query, element_ids=element_ids)
+            return [record["entity"] async for record in result]
+
+        async with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            return await session.execute_read(_read)
+
+    async def _query_concept_with_context(self, concept_name: str, domain: str) -> Dict[str, Any]:
+        """Run the concept context query against Neo4j"""
         query = """
         MATCH (c:Concept {name: $concept_name})-[:BELONGS_TO]->(d:Domain {name: $domain})
 
@@ -42,16 +200,22 @@ class GraphService:
         // Get chapter content
         OPTIONAL MATCH (c)-[:PART_OF]->(chapter:Chapter)-[:BELONGS_TO]->(book:Book)
 
-        RETURN c as concept,
-               collect(DISTINCT prereq) as prerequisites,
-               collect(DISTINCT example) as examples,
-               collect(DISTINCT related) as related_concepts,
-               collect(DISTINCT {chapter: chapter, book: book}) as source_content
+        // Project to plain maps so the driver returns dicts, not Node
+        // objects; element ids key the entity cache
+        RETURN c {.*, id: elementId(c)} as concept,
+               collect(DISTINCT prereq {.*, id: elementId(prereq)}) as prerequisites,
+               collect(DISTINCT example {.*, id: elementId(example)}) as examples,
+               collect(DISTINCT related {.*, id: elementId(related)}) as related_concepts,
+               collect(DISTINCT {chapter: chapter {.*}, book: book {.*}}) as source_content
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(query, concept_name=concept_name, domain=domain)
-            record = await result.single()
+        async def _read(tx):
+            result = await tx.run(query, concept_name=concept_name, domain=domain)
+            return await result.single()
+
+        # Read-only session: routes to replicas and retries transient errors
+        async with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            record = await session.execute_read(_read)
 
             if not record:
                 raise ValueError(f"Concept '{concept_name}' not found in domain '{domain}'")
@@ -60,21 +224,13 @@ class GraphService:
 
     def _format_concept_data(self, record) -> Dict[str, Any]:
         """Format Neo4j record into structured data"""
-        concept = dict(record["concept"])
-        prerequisites = [dict(p) for p in record["prerequisites"]]
-        examples = [dict(e) for e in record["examples"]]
-        related_concepts = [dict(r) for r in record["related_concepts"]]
-        source_content = [
-            {"chapter": dict(sc["chapter"]), "book": dict(sc["book"])}
-            for sc in record["source_content"] if sc["chapter"]
-        ]
-
+        # Fields are already projected to maps in Cypher
         return {
-            "concept": concept,
-            "prerequisites": prerequisites,
-            "examples": examples,
-            "related_concepts": related_concepts,
-            "source_content": source_content
+            "concept": record["concept"],
+            "prerequisites": record["prerequisites"],
+            "examples": record["examples"],
+            "related_concepts": record["related_concepts"],
+            "source_content": [sc for sc in record["source_content"] if sc["chapter"]]
         }
 
     async def search_concepts(self, query: str, domain: str = None, limit: int = 10) -> List[Dict[str, Any]]:
@@ -98,14 +254,17 @@ class GraphService:
         LIMIT $limit
         """
 
-        async with self.driver.session() as session:
-            result = await session.run(cypher_query, query=query, domain=domain, limit=limit)
+        async def _read(tx):
+            result = await tx.run(cypher_query, query=query, domain=domain, limit=limit)
             concepts = []
             async for record in result:
                 concepts.append(dict(record["c"]))
             return concepts
 
+        async with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            return await session.execute_read(_read)
+
     async def close(self):
         """Close Neo4j connection"""
-        if self.driver:
+        if self.driver and self._owns_driver:
             await self.driver.close()
\ No newline at end of file
@@ -1,14 +1,49 @@
 import asyncio
+import functools
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Callable, List, Optional
 from dataclasses import dataclass
+import redis.asyncio as redis
 
-from pipeline.knowledge_graph.graph_service import GraphService
-from pipeline.ai_services.content_generator import ContentGenerator
-from pipeline.animation.manim_engine import ManimEngine
-from pipeline.storage.s3_client import S3Client
-from pipeline.storage.postgres_client import PostgresClient
-from pipeline.storage.cache_service import CacheService
+from pipeline.dag import run_dag
+
+from pipeline.knowledge_graph.graph_service import CONCEPT_INVALIDATION_CHANNEL
+from pipeline.storage.postgres_client import TaskStatusUpdate
+from pipeline.storage.s3_client import PendingUpload
+from pipeline.services import (
+    get_graph_service,
+    get_content_generator,
+    get_manim_engine,
+    get_s3_client,
+    get_postgres_client,
+    get_cache_service,
+    get_semantic_cache,
+    initialize_service,
+    close_service
+)
+
+
+# Redis flag set when a task is cancelled, and how often it is polled
+CANCEL_KEY = "cancel:{task_id}"
+CANCEL_POLL_INTERVAL = 1.0
+
+# Status updates are written in batches: the flusher waits this long for
+# more updates after the first one, up to a maximum batch size
+STATUS_FLUSH_INTERVAL = 0.05
+STATUS_FLUSH_BATCH_SIZE = 100
+# Batches written at once, each on its own pooled connection
+STATUS_FLUSH_CONCURRENCY = 4
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Finished videos are also stored under a hash of their content, so an
+# identical slides/script plan is copied instead of rendered again
+RENDER_CACHE_KEY = "videos/by-hash/{digest}.mp4"
+RENDER_CACHE_STATS_KEY = "render_cache:stats"
+
+
+class TaskCancelled(Exception):
+    """Raised when work is stopped because its task's cancel flag was set"""
 
 
 @dataclass
@@ -20,134 +55,421 @@ class GenerationRequest:
 
 
 class VideoGenerationOrchestrator:
-    def __init__(self):
-        self.graph_service = GraphService()
-        self.content_generator = ContentGenerator()
-        self.manim_engine = ManimEngine()
-        self.s3_client = S3Client()
-        self.postgres_client = PostgresClient()
-        self.cache_service = CacheService()
+    """
+    Runs the pipeline for any number of tasks. It owns process-wide
+    resources (a Redis client, the status flusher and the invalidation
+    subscription) and shuts down the shared services, so use the
+    per-process instance from get_orchestrator() rather than building one.
+    """
+
+    def __init__(self, neo4j_driver=None, openai_client=None):
+        # Service clients come from pipeline.services, shared per process
+        self.graph_service = get_graph_service(neo4j_driver)
+        self.content_generator = get_content_generator(openai_client)
+        self.manim_engine = get_manim_engine()
+        self.s3_client = get_s3_client()
+        self.postgres_client = get_postgres_client()
+        self.cache_service = get_cache_service()
+        self.semantic_cache = get_semantic_cache(self.content_generator)
+        self.redis = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+        self._status_queue = asyncio.Queue()
+        self._status_flusher = None
         self.logger = logging.getLogger(__name__)
 
     async def initialize(self):
-        """Initialize all services"""
-        await asyncio.gather(
-            self.graph_service.initialize(),
-            self.content_generator.initialize(),
-            self.manim_engine.initialize(),
-            self.s3_client.initialize(),
-            self.postgres_client.initialize(),
-            self.cache_service.initialize()
+        """Initialize all services; further calls are no-ops until shutdown()"""
+        if self._status_flusher is not None:
+            return
+        services = (
+            self.graph_service,
+            self.content_generator,
+            self.manim_engine,
+            self.s3_client,
+            self.postgres_client,
+            self.cache_service
         )
+        try:
+            # If one service fails the others are cancelled, and whatever
+            # did come up is closed again
+            async with asyncio.TaskGroup() as tg:
+                for service in services:
+                    tg.create_task(initialize_service(service))
+        except BaseException:
+            await self.shutdown()
+            raise
+
+        self._status_flusher = asyncio.create_task(self._flush_status_loop())
+        await self.cache_service.subscribe(CONCEPT_INVALIDATION_CHANNEL, self._on_concept_invalidated)
         self.logger.info("Pipeline orchestrator initialized")
 
-    async def generate_video_async(self, task_id: str, concept_name: str, domain: str, difficulty_level: str):
+    async def shutdown(self):
+        """Write pending status updates and close all services"""
+        if self._status_flusher is not None:
+            try:
+                await self.flush_status_updates()
+            except Exception:
+                self.logger.exception("Failed to write pending status updates on shutdown")
+            self._status_flusher.cancel()
+            await asyncio.gather(self._status_flusher, return_exceptions=True)
+            self._status_flusher = None
+
+        results = await asyncio.gather(
+            close_service(self.graph_service),
+            close_service(self.s3_client),
+            close_service(self.postgres_client),
+            close_service(self.cache_service),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("Failed to close service", exc_info=result)
+        await self.redis.aclose()
+
+    async def is_cancelled(self, task_id: str) -> bool:
+        """Whether the task's cancel flag has been set"""
+        return bool(await self.redis.get(CANCEL_KEY.format(task_id=task_id)))
+
+    async def run_unless_cancelled(self, task_id: str, coro):
         """
-        Main async video generation pipeline
+        Run coro, stopping it as soon as the task's cancel flag is set.
+        Cancelling also kills any manim/FFmpeg process group it started.
+        Raises TaskCancelled if the flag stopped it.
         """
-        request = GenerationRequest(task_id, concept_name, domain, difficulty_level)
-
+        work = asyncio.ensure_future(coro)
+        watcher = asyncio.create_task(self._watch_for_cancel(task_id, work))
         try:
-            # Update status: Starting
-            await self._update_task_status(task_id, "processing", 0, "Starting video generation")
+            return await work
+        except asyncio.CancelledError:
+            if not (watcher.done() and not watcher.cancelled() and watcher.result()):
+                raise
+            raise TaskCancelled(task_id)
+        finally:
+            watcher.cancel()
 
-            # Step 1: Knowledge Retrieval (20% progress)
-            concept_data = await self._retrieve_concept_knowledge(request)
-            await self._update_task_status(task_id, "processing", 20, "Retrieved concept knowledge")
+    async def cancel_task(self, task_id: str, upload_id: str = None):
+        """Mark a task as cancelled, removing its scratch files and aborting its upload"""
+        self.manim_engine.cleanup_workspace(task_id)
+        if upload_id is not None:
+            await self.abort_upload(task_id, upload_id)
+        await self.postgres_client.update("videos", {"status": "cancelled"}, "id = $1", task_id)
+        await self._update_task_status(task_id, "cancelled", -1, "Video generation cancelled")
+        self.logger.info("Video generation cancelled for task %s", task_id)
 
-            # Step 2: Content Generation (40% progress)
-            slides, script = await self._generate_educational_content(concept_data, request)
-            await self._update_task_status(task_id, "processing", 40, "Generated slides and script")
+    async def _watch_for_cancel(self, task_id: str, pipeline: asyncio.Task) -> bool:
+        """Cancel the pipeline once the task's cancel flag is set"""
+        while not pipeline.done():
+            if await self.is_cancelled(task_id):
+                pipeline.cancel()
+                return True
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+        return False
 
-            # Step 3: Animation Creation (80% progress)
-            video_path = await self._create_video_animation(slides, script, request)
-            await self._update_task_status(task_id, "processing", 80, "Created video animation")
+    async def prepare_content(self, request: GenerationRequest, on_scene: Callable[[int, Dict, Dict], Any] = None):
+        """
+        Retrieve concept knowledge and stream slides and script, calling
+        on_scene(scene_number, slide, script) as soon as each scene has
+        been generated so it can start rendering elsewhere
+        """
+        # Step 1: Knowledge Retrieval
+        async def retrieve_knowledge():
+            return await self._start_and_retrieve(request)
 
-            # Step 4: Storage and Finalization (100% progress)
-            video_url = await self._store_and_finalize(video_path, request)
-            await self._update_task_status(task_id, "completed", 100, "Video generation completed", video_url)
+        # Step 2: Content Generation (40% progress)
+        async def generate_content(retrieve_knowledge):
+            slides, script = [], []
+            async for slide, scene_script in self._stream_educational_content(retrieve_knowledge, request):
+                if on_scene is not None:
+                    on_scene(len(slides), slide, scene_script)
+                slides.append(slide)
+                script.append(scene_script)
+            return slides, script
 
-            self.logger.info(f"Video generation completed for task {task_id}")
+        # Independent of the content, so it runs alongside the steps above
+        async def prepare_db_row():
+            await self._prepare_video_record(request)
 
-        except Exception as e:
-            await self._update_task_status(task_id, "failed", -1, f"Error: {str(e)}")
-            self.logger.error(f"Video generation failed for task {task_id}: {str(e)}")
-            raise
+        results = await run_dag({
+            "retrieve_knowledge": (retrieve_knowledge, []),
+            "generate_content": (generate_content, ["retrieve_knowledge"]),
+            "prepare_db_row": (prepare_db_row, []),
+        })
+
+        # Rendering may continue in another worker; make sure queued
+        # status updates are written before handing off
+        await self.flush_status_updates()
+
+        return results["generate_content"]
+
+    async def _start_and_retrieve(self, request: GenerationRequest) -> Dict[str, Any]:
+        """Mark the task started and retrieve its concept knowledge"""
+        # Update status: Starting
+        await self._update_task_status(request.task_id, "processing", 0, "Starting video generation")
+
+        # Step 1: Knowledge Retrieval (20% progress)
+        concept_data = await self._retrieve_concept_knowledge(request)
+        await self._update_task_status(request.task_id, "processing", 20, "Retrieved concept knowledge")
+
+        return concept_data
+
+    async def finalize_video(self, video_url: str, request: GenerationRequest) -> str:
+        """
+        Record an uploaded video and mark the task completed
+        """
+        task_id = request.task_id
+
+        try:
+            # Step 4: Finalization (100% progress); the video row and the
+            # completed task are written in a single round trip
+            completed = TaskStatusUpdate(task_id, "completed", 100, "Video generation completed", video_url)
+            await self._store_and_finalize(video_url, request, completed)
+        finally:
+            # Scene renders are only needed until the video is uploaded
+            self.manim_engine.cleanup_workspace(task_id)
+
+        self.logger.info("Video generation completed for task %s", task_id)
+        return video_url
+
+    async def fail_task(self, task_id: str, error: Exception):
+        """Mark a task as failed"""
+        await self.postgres_client.update("videos", {"status": "failed"}, "id = $1", task_id)
+        await self._update_task_status(task_id, "failed", -1, f"Error: {str(error)}")
+        self.logger.error("Video generation failed for task %s", task_id, exc_info=error)
 
     async def _retrieve_concept_knowledge(self, request: GenerationRequest) -> Dict[str, Any]:
-        """Retrieve concept and related knowledge from graph database"""
-        cache_key = f"concept_knowledge:{request.concept_name}:{request.domain}"
+        """
+        Retrieve concept and related knowledge from graph database. The
+        graph service caches the knowledge itself; the semantic cache only
+        maps differently phrased but equivalent names to the concept's
+        canonical name, so updates in the graph are never hidden behind it.
+        It is consulted only when the name as given misses the shared graph
+        cache, since every lookup costs an embedding call.
+        """
+        concept_data = await self.graph_service.get_cached_concept(request.concept_name, request.domain)
+        if concept_data is not None:
+            return concept_data
 
-        # Check cache first
-        cached_data = await self.cache_service.get(cache_key)
-        if cached_data:
-            return cached_data
+        try:
+            canonical_name = await self.semantic_cache.get(request.concept_name, request.domain)
+        except Exception:
+            # Lookups need an embedding call; without one, use the name as given
+            self.logger.exception("Semantic cache lookup failed for %s", request.concept_name)
+            canonical_name = None
 
-        # Query knowledge graph
         concept_data = await self.graph_service.get_concept_with_context(
-            concept_name=request.concept_name,
+            concept_name=canonical_name or request.concept_name,
             domain=request.domain,
             depth=2
         )
 
-        # Cache the result
-        await self.cache_service.set(cache_key, concept_data, ttl=3600)
+        if canonical_name is None:
+            try:
+                await self.semantic_cache.set(request.concept_name, request.domain, concept_data["concept"]["name"])
+            except Exception:
+                self.logger.exception("Failed to cache canonical name for %s", request.concept_name)
 
         return concept_data
 
-    async def _generate_educational_content(self, concept_data: Dict[str, Any], request: GenerationRequest):
-        """Generate slides and script using AI"""
-        content = await self.content_generator.generate_educational_content(
+    async def _on_concept_invalidated(self, message: Dict[str, str]):
+        """Forget names resolved to a concept updated in the graph"""
+        await self.semantic_cache.invalidate(message["concept_name"], message["domain"])
+
+    async def _stream_educational_content(self, concept_data: Dict[str, Any], request: GenerationRequest):
+        """Stream (slide, script) pairs from the AI as they are generated"""
+        async for scene in self.content_generator.stream_educational_content(
             concept_data=concept_data,
             difficulty_level=request.difficulty_level,
             domain=request.domain
-        )
-        return content['slides'], content['script']
-
-    async def _create_video_animation(self, slides, script, request: GenerationRequest) -> str:
-        """Create animated video using Manim"""
-        video_path = await self.manim_engine.generate_video(
-            slides=slides,
-            script=script,
-            task_id=request.task_id
-        )
-        return video_path
-
-    async def _store_and_finalize(self, video_path: str, request: GenerationRequest) -> str:
-        """Store video and create database records"""
-        # Upload to S3
-        s3_url = await self.s3_client.upload_video(
-            file_path=video_path,
-            key=f"videos/{request.task_id}/output.mp4"
-        )
+        ):
+            yield scene
+        await self._update_task_status(request.task_id, "processing", 40, "Generated slides and script")
+
+    async def reuse_cached_render(self, cache_key: str, request: GenerationRequest) -> Optional[str]:
+        """Copy an earlier render of the same content to this task's key, if any"""
+        source_key = RENDER_CACHE_KEY.format(digest=cache_key)
+        hit = await self.s3_client.object_exists(source_key)
+        await self.redis.hincrby(RENDER_CACHE_STATS_KEY, "hits" if hit else "misses", 1)
+        if not hit:
+            return None
+
+        self.logger.info("Reusing cached render %s for task %s", cache_key, request.task_id)
+        return await self.s3_client.copy_object(source_key, self._video_key(request.task_id))
+
+    async def store_cached_render(self, cache_key: str, request: GenerationRequest):
+        """Publish this task's video under its content hash"""
+        try:
+            await self.s3_client.copy_object(self._video_key(request.task_id), RENDER_CACHE_KEY.format(digest=cache_key))
+        except Exception:
+            # The video itself is already stored; only reuse is lost
+            self.logger.exception("Failed to cache render for task %s", request.task_id)
+
+    async def render_cache_stats(self) -> Dict[str, Any]:
+        """Hit and miss counts for the render cache"""
+        stats = await self.redis.hgetall(RENDER_CACHE_STATS_KEY)
+        hits = int(stats.get(b"hits", 0))
+        misses = int(stats.get(b"misses", 0))
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
 
-        # Create database record
-        video_record = {
+    def _video_key(self, task_id: str) -> str:
+        return f"videos/{task_id}/output.mp4"
+
+    async def start_upload(self, task_id: str) -> str:
+        """
+        Start a task's video upload ahead of rendering, so its id is ready
+        by the time encoding begins instead of costing a round trip then
+        """
+        return await self.s3_client.create_multipart_upload(self._video_key(task_id))
+
+    async def abort_upload(self, task_id: str, upload_id: str):
+        """Abort a pre-started upload that will not be completed"""
+        try:
+            await self.s3_client.abort_multipart_upload(self._video_key(task_id), upload_id)
+        except Exception:
+            # Already aborted by the uploader
+            pass
+
+    def video_uploader(self, request: GenerationRequest, upload_id: str = None):
+        """
+        Return a consumer that uploads an encoder's output stream to S3,
+        continuing the upload started by start_upload() if upload_id is
+        given. The consumer returns the pending upload, which the encoder
+        completes once it has exited successfully.
+        """
+        async def _upload(reader) -> PendingUpload:
+            return await self.s3_client.upload_stream(
+                reader=reader,
+                key=self._video_key(request.task_id),
+                upload_id=upload_id
+            )
+        return _upload
+
+    def _video_record(self, request: GenerationRequest, s3_url: str, status: str) -> Dict[str, Any]:
+        return {
             "id": request.task_id,
             "concept_name": request.concept_name,
             "domain": request.domain,
             "difficulty_level": request.difficulty_level,
             "s3_url": s3_url,
-            "status": "completed"
+            "status": status
         }
 
-        await self.postgres_client.insert("videos", video_record)
+    async def _prepare_video_record(self, request: GenerationRequest):
+        """
+        Create the video's database record ahead of rendering; a retried
+        task finds its record already there
+        """
+        s3_url = self.s3_client.object_url(self._video_key(request.task_id))
+        await self.postgres_client.insert(
+            "videos", self._video_record(request, s3_url, "processing"), on_conflict_do_nothing=True
+        )
+
+    async def _store_and_finalize(self, s3_url: str, request: GenerationRequest, task_update: TaskStatusUpdate) -> str:
+        """Complete the video record and its task in one round trip"""
+        await self.postgres_client.finalize_task(
+            self._video_record(request, s3_url, "completed"), task_update
+        )
 
         return s3_url
 
     async def _update_task_status(self, task_id: str, status: str, progress: int, message: str, video_url: str = None):
-        """Update task status in database and notify via WebSocket"""
-        task_update = {
-            "task_id": task_id,
-            "status": status,
-            "progress": progress,
-            "message": message,
-            "video_url": video_url,
-            "updated_at": "now()"
-        }
+        """
+        Update task status in the database; the write itself notifies
+        WebSocket subscribers through the task update trigger
+        """
+        task_update = TaskStatusUpdate(task_id, status, progress, message, video_url)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Task status update: %r", task_update)
+
+        # Update database: progress updates are queued for the batched
+        # flusher; terminal states wait until they have been written
+        if status in TERMINAL_STATUSES:
+            written = asyncio.get_running_loop().create_future()
+            self._status_queue.put_nowait((task_update, written))
+            await written
+        else:
+            self._status_queue.put_nowait((task_update, None))
+
+    async def flush_status_updates(self):
+        """Wait until every status update queued so far has been written"""
+        written = asyncio.get_running_loop().create_future()
+        self._status_queue.put_nowait((None, written))
+        await written
+
+    async def _flush_status_loop(self):
+        """Drain queued status updates and write them in batches"""
+        loop = asyncio.get_running_loop()
+        # The next batch is collected and sent while earlier ones are still
+        # in flight; the UPDATE is idempotent, so write order doesn't matter
+        slots = asyncio.Semaphore(STATUS_FLUSH_CONCURRENCY)
+        writes = set()
+        previous_write = None
+        try:
+            while True:
+                batch = [await self._status_queue.get()]
+                deadline = loop.time() + STATUS_FLUSH_INTERVAL
+                while len(batch) < STATUS_FLUSH_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._status_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await slots.acquire()
+                previous_write = asyncio.create_task(self._write_status_batch(batch, previous_write, slots))
+                writes.add(previous_write)
+                previous_write.add_done_callback(writes.discard)
+        finally:
+            for write in writes:
+                write.cancel()
+
+    async def _write_status_batch(self, batch: List, previous_write: Optional[asyncio.Task], slots: asyncio.Semaphore):
+        """Write one batch of status updates and resolve its waiters"""
+        # Only the furthest update per task is written
+        latest = {}
+        for task_update, _ in batch:
+            if task_update is None:
+                continue
+            previous = latest.get(task_update.task_id)
+            if previous is None or self._supersedes(task_update, previous):
+                latest[task_update.task_id] = task_update
+
+        try:
+            if latest:
+                await self.postgres_client.update_task_statuses(list(latest.values()))
+            error = None
+        except Exception as e:
+            self.logger.exception("Failed to write %d task status updates", len(latest))
+            error = e
+        finally:
+            slots.release()
+
+        # Waiters are resolved in queue order, so flush_status_updates()
+        # also covers batches sent before its own
+        if previous_write is not None:
+            await asyncio.wait({previous_write})
+
+        for _, written in batch:
+            if written is None or written.done():
+                continue
+            if error:
+                written.set_exception(error)
+            else:
+                written.set_result(None)
+
+    def _supersedes(self, task_update: TaskStatusUpdate, previous: TaskStatusUpdate) -> bool:
+        """Same rule update_task_statuses applies against the stored row"""
+        if previous.status in TERMINAL_STATUSES:
+            return False
+        return task_update.progress > previous.progress or task_update.status != previous.status
 
-        # Update database
-        await self.postgres_client.update("generation_tasks", task_update, f"id = '{task_id}'")
 
-        # Notify via WebSocket (would need WebSocket manager reference)
-        # await websocket_manager.send_update(task_id, task_update)
+@functools.cache
+def get_orchestrator(neo4j_driver=None, openai_client=None) -> VideoGenerationOrchestrator:
+    """The process-wide orchestrator"""
+    return VideoGenerationOrchestrator(neo4j_driver=neo4j_driver, openai_client=openai_client)
@@ -0,0 +1,79 @@
+import asyncio
+import functools
+from typing import Any, Dict
+
+from pipeline.knowledge_graph.graph_service import GraphService
+from pipeline.ai_services.content_generator import ContentGenerator
+from pipeline.animation.manim_engine import ManimEngine
+from pipeline.storage.s3_client import S3Client
+from pipeline.storage.postgres_client import PostgresClient
+from pipeline.storage.cache_service import CacheService
+from pipeline.storage.semantic_cache import SemanticCache
+
+# Service clients are shared by every orchestrator in the process; each
+# factory builds its service once per distinct set of arguments
+
+
+@functools.cache
+def get_graph_service(driver=None) -> GraphService:
+    return GraphService(get_cache_service(), driver=driver)
+
+
+@functools.cache
+def get_content_generator(openai_client=None) -> ContentGenerator:
+    return ContentGenerator(openai_client=openai_client)
+
+
+@functools.cache
+def get_manim_engine() -> ManimEngine:
+    return ManimEngine()
+
+
+@functools.cache
+def get_s3_client() -> S3Client:
+    return S3Client()
+
+
+@functools.cache
+def get_postgres_client() -> PostgresClient:
+    return PostgresClient()
+
+
+@functools.cache
+def get_cache_service() -> CacheService:
+    return CacheService()
+
+
+@functools.cache
+def get_semantic_cache(content_generator: ContentGenerator) -> SemanticCache:
+    return SemanticCache(embed=content_generator.embed)
+
+
+# In-flight or finished initialize() calls, by service
+_initialized: Dict[int, asyncio.Task] = {}
+
+
+async def initialize_service(service: Any):
+    """
+    Initialize a shared service once per process. Concurrent first callers
+    wait on the same initialize() call; if it fails, the next call retries.
+    """
+    task = _initialized.get(id(service))
+    if task is None:
+        task = asyncio.ensure_future(service.initialize())
+        _initialized[id(service)] = task
+    try:
+        await asyncio.shield(task)
+    except Exception:
+        if _initialized.get(id(service)) is task:
+            del _initialized[id(service)]
+        raise
+
+
+async def close_service(service: Any):
+    """Close a shared service; the next initialize_service() call reopens it"""
+    task = _initialized.pop(id(service), None)
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    await service.close()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as redis
+import zstandard
+
+# Values larger than this are stored zstd-compressed, tagged with a prefix
+# that can't start a JSON document
+COMPRESSION_THRESHOLD = 4096
+COMPRESSION_LEVEL = 3
+COMPRESSED_PREFIX = b"zst:"
+# Wait before resubscribing after a pubsub connection is lost
+RESUBSCRIBE_DELAY = 1.0
+
+
+class CacheService:
+    def __init__(self):
+        self.redis = None
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        self._listeners = []
+        self._compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self.logger = logging.getLogger(__name__)
+
+    async def initialize(self):
+        """Initialize Redis connection"""
+        self.redis = redis.Redis.from_url(self.redis_url)
+
+    def _encode(self, value: Any) -> bytes:
+        payload = json.dumps(value, default=str).encode()
+        if len(payload) > COMPRESSION_THRESHOLD:
+            payload = COMPRESSED_PREFIX + self._compressor.compress(payload)
+        return payload
+
+    def _decode(self, value: Optional[bytes]) -> Optional[Any]:
+        if value is None:
+            return None
+        if value.startswith(COMPRESSED_PREFIX):
+            value = self._decompressor.decompress(value[len(COMPRESSED_PREFIX):])
+        return json.loads(value)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a JSON value, or None on a miss"""
+        return self._decode(await self.redis.get(key))
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several JSON values in one round trip, with None for misses"""
+        return [self._decode(value) for value in await self.redis.mget(keys)]
+
+    async def set(self, key: str, value: Any, ttl: int = None):
+        """Store a JSON value with an optional TTL in seconds"""
+        await self.redis.set(key, self._encode(value), ex=ttl)
+
+    async def set_many(self, values: Dict[str, Any], ttl: int = None):
+        """Store several JSON values in one round trip"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, self._encode(value), ex=ttl)
+            await pipe.execute()
+
+    async def delete(self, *keys: str):
+        """Remove one or more keys"""
+        await self.redis.delete(*keys)
+
+    async def publish(self, channel: str, message: Any):
+        """Publish a JSON message on a channel"""
+        await self.redis.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str, handler: Callable[[Any], Awaitable[None]]):
+        """
+        Call handler with every JSON message published on channel. The
+        subscription is re-established if its connection is lost;
+        messages published while it is down are missed.
+        """
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(channel)
+        self._listeners.append(asyncio.create_task(self._listen(pubsub, channel, handler)))
+
+    async def _listen(self, pubsub, channel: str, handler: Callable[[Any], Awaitable[None]]):
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = self.redis.pubsub()
+                    await pubsub.subscribe(channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        await handler(json.loads(message["data"]))
+                    except Exception:
+                        self.logger.exception("Cache message handler failed for %s", channel)
+            except Exception:
+                self.logger.exception("Subscription to %s lost; resubscribing", channel)
+            finally:
+                if pubsub is not None:
+                    await self._close_pubsub(pubsub)
+                    pubsub = None
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    async def _close_pubsub(self, pubsub):
+        try:
+            await pubsub.aclose()
+        except Exception:
+            # The connection is usually already gone
+            pass
+
+    async def close(self):
+        """Stop listeners and close Redis connection"""
+        for listener in self._listeners:
+            listener.cancel()
+        await asyncio.gather(*self._listeners, return_exceptions=True)
+        if self.redis:
+            await self.redis.aclose()
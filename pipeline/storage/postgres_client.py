@@ -0,0 +1,305 @@
+import asyncio
+import asyncpg
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Any, Optional
+
+POOL_SETTINGS = {
+    "min_size": 4,
+    "max_size": 32,
+    "command_timeout": 30
+}
+
+# Every change to a task's status or progress is announced on this
+# channel by a trigger, so API servers can push it to WebSocket clients
+TASK_UPDATES_CHANNEL = "task_updates"
+# A dropped LISTEN connection is reopened after this delay; an idle one
+# is checked this often, since a half-open socket only fails when used
+LISTEN_RECONNECT_DELAY = 1.0
+LISTEN_HEALTH_CHECK_INTERVAL = 30.0
+
+# Task update payload built from a generation_tasks row; the trigger and
+# get_task_update() produce identical JSON
+TASK_UPDATE_PAYLOAD = """json_build_object(
+        'task_id', {row}.id,
+        'status', {row}.status,
+        'progress', {row}.progress,
+        'message', left({row}.message, 1000),
+        'video_url', {row}.video_url
+    )::text"""
+
+TASK_UPDATES_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION notify_task_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{TASK_UPDATES_CHANNEL}', {TASK_UPDATE_PAYLOAD.format(row="NEW")});
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER generation_tasks_notify
+AFTER UPDATE ON generation_tasks
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.progress IS DISTINCT FROM NEW.progress)
+EXECUTE FUNCTION notify_task_update();
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class TaskStatusUpdate:
+    task_id: str
+    status: str
+    progress: int
+    message: str
+    video_url: Optional[str] = None
+
+
+# Batched, idempotent status write: terminal states are final, and within
+# a status progress only moves forward. Rows are passed as parallel
+# arrays, so the text is the same for any batch size and is prepared once
+# per connection
+UPDATE_TASK_STATUSES_SQL = """
+UPDATE generation_tasks AS t
+SET status = v.status,
+    progress = v.progress,
+    message = v.message,
+    video_url = v.video_url,
+    updated_at = now()
+FROM unnest($1::uuid[], $2::text[], $3::int[], $4::text[], $5::text[])
+     AS v(id, status, progress, message, video_url)
+WHERE t.id = v.id
+  AND t.status NOT IN ('completed', 'failed', 'cancelled')
+  AND (v.progress > t.progress OR v.status <> t.status)
+"""
+
+# One pool per DSN for the whole process, shared by every PostgresClient
+_connection_pools: Dict[str, asyncpg.Pool] = {}
+_pools_lock = asyncio.Lock()
+
+
+async def get_pool(dsn: str, **settings) -> asyncpg.Pool:
+    """Return the process-wide pool for a DSN, creating it on first use"""
+    async with _pools_lock:
+        pool = _connection_pools.get(dsn)
+        if pool is None:
+            pool = await asyncpg.create_pool(dsn, **{**POOL_SETTINGS, **settings})
+            _connection_pools[dsn] = pool
+        return pool
+
+
+async def close_all_pools():
+    """Close every shared pool; call once on process shutdown"""
+    async with _pools_lock:
+        pools = list(_connection_pools.values())
+        _connection_pools.clear()
+    await asyncio.gather(*(pool.close() for pool in pools))
+
+
+class NotificationListener:
+    """
+    A dedicated LISTEN connection that is reopened whenever it is lost,
+    either reported by asyncpg or found by a periodic health check.
+    Notifications sent while it is down are missed, so on_reconnect is
+    awaited after every reconnect to let the owner catch up.
+    """
+
+    def __init__(self, dsn: str, channel: str, callback: Callable,
+                 on_reconnect: Callable[[], Awaitable[None]] = None):
+        self.dsn = dsn
+        self.channel = channel
+        self.callback = callback
+        self.on_reconnect = on_reconnect
+        self.connection = None
+        self._lost = asyncio.Event()
+        self._supervisor = None
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        """Connect, failing if the database is unreachable, and keep the connection alive"""
+        await self._connect()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def _connect(self):
+        self._lost.clear()
+        connection = await asyncpg.connect(self.dsn)
+        connection.add_termination_listener(self._on_terminated)
+        await connection.add_listener(self.channel, self.callback)
+        self.connection = connection
+
+    def _on_terminated(self, connection):
+        if connection is self.connection:
+            self._lost.set()
+
+    async def _supervise(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._lost.wait(), LISTEN_HEALTH_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                try:
+                    await self.connection.execute("SELECT 1", timeout=LISTEN_HEALTH_CHECK_INTERVAL)
+                    continue
+                except Exception:
+                    self.logger.exception("Health check failed on LISTEN %s", self.channel)
+
+            self.logger.warning("LISTEN connection for %s lost; reconnecting", self.channel)
+            # Detach the old connection first: asyncpg reports its
+            # termination on a later loop iteration, which must not mark
+            # the replacement as lost
+            stale, self.connection = self.connection, None
+            stale.remove_termination_listener(self._on_terminated)
+            stale.terminate()
+            while True:
+                try:
+                    await self._connect()
+                    break
+                except Exception:
+                    self.logger.exception("Failed to reconnect LISTEN %s", self.channel)
+                    await asyncio.sleep(LISTEN_RECONNECT_DELAY)
+
+            if self.on_reconnect is not None:
+                try:
+                    await self.on_reconnect()
+                except Exception:
+                    self.logger.exception("Catch-up after reconnecting LISTEN %s failed", self.channel)
+
+    async def close(self):
+        """Stop listening and close the connection"""
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+        if self.connection is not None:
+            await self.connection.close()
+
+
+class PostgresClient:
+    def __init__(self):
+        self.pool = None
+        self.dsn = "postgresql://{user}:{password}@{host}/{db}".format(
+            user=os.getenv("POSTGRES_USER", "postgres"),
+            password=os.getenv("POSTGRES_PASSWORD", "password"),
+            host=os.getenv("POSTGRES_SERVER", "localhost"),
+            db=os.getenv("POSTGRES_DB", "education_platform")
+        )
+        # "transaction" when connecting through PgBouncer/Supavisor in
+        # transaction pooling mode
+        self.pooler_mode = os.getenv("PG_POOLER_MODE", "session")
+
+    async def initialize(self):
+        """Attach to the shared PostgreSQL connection pool"""
+        settings = {}
+        if self.pooler_mode == "transaction":
+            # Consecutive statements may run on different server
+            # connections, so named prepared statements can't be reused
+            settings["statement_cache_size"] = 0
+        self.pool = await get_pool(self.dsn, **settings)
+
+    async def insert(self, table: str, record: Dict[str, Any], on_conflict_do_nothing: bool = False):
+        """Insert a single row, optionally skipping it if it already exists"""
+        columns = ", ".join(record)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(record) + 1))
+        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        if on_conflict_do_nothing:
+            query += " ON CONFLICT DO NOTHING"
+
+        async with self.pool.acquire() as connection:
+            await connection.execute(query, *record.values())
+
+    async def update(self, table: str, data: Dict[str, Any], where_sql: str, *where_args):
+        """
+        Update rows matching a parameterized WHERE clause, e.g.
+        update("generation_tasks", data, "id = $1", task_id).
+
+        WHERE placeholders come first and SET values are numbered after
+        them, so the statement text only depends on the columns updated
+        and asyncpg reuses its prepared statement.
+        """
+        offset = len(where_args)
+        set_clause = ", ".join(
+            f"{column} = ${i}" for i, column in enumerate(data, start=offset + 1)
+        )
+        query = f"UPDATE {table} SET {set_clause} WHERE {where_sql}"
+
+        async with self.pool.acquire() as connection:
+            await connection.execute(query, *where_args, *data.values())
+
+    async def finalize_task(self, video_row: Dict[str, Any], task_update: TaskStatusUpdate):
+        """
+        Upsert a video's row and mark its task completed in one statement,
+        so finalization costs a single round trip. A task that has already
+        failed or been cancelled keeps its status.
+        """
+        columns = ", ".join(video_row)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(video_row) + 1))
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in video_row if column != "id")
+        offset = len(video_row)
+        query = f"""
+        WITH v AS (
+            INSERT INTO videos ({columns}) VALUES ({placeholders})
+            ON CONFLICT (id) DO UPDATE SET {updates}
+            RETURNING id
+        )
+        UPDATE generation_tasks
+        SET status = ${offset + 1},
+            progress = ${offset + 2},
+            message = ${offset + 3},
+            video_url = ${offset + 4},
+            updated_at = now()
+        WHERE id = (SELECT id FROM v)
+          AND status NOT IN ('completed', 'failed', 'cancelled')
+        """
+
+        async with self.pool.acquire() as connection:
+            await connection.execute(
+                query,
+                *video_row.values(),
+                task_update.status,
+                task_update.progress,
+                task_update.message,
+                task_update.video_url
+            )
+
+    async def update_task_statuses(self, updates: List[TaskStatusUpdate]):
+        """
+        Apply a batch of task status updates in one statement. Retried or
+        out-of-order updates are no-ops; rows that change fire the task
+        update trigger.
+        """
+        async with self.pool.acquire() as connection:
+            await connection.execute(
+                UPDATE_TASK_STATUSES_SQL,
+                [u.task_id for u in updates],
+                [u.status for u in updates],
+                [u.progress for u in updates],
+                [u.message for u in updates],
+                [u.video_url for u in updates]
+            )
+
+    async def install_task_updates_trigger(self):
+        """Create or refresh the trigger that announces task updates"""
+        async with self.pool.acquire() as connection:
+            await connection.execute(TASK_UPDATES_TRIGGER)
+
+    async def get_task_update(self, task_id: str) -> Optional[str]:
+        """A task's current state as a task update payload, or None if it doesn't exist"""
+        async with self.pool.acquire() as connection:
+            return await connection.fetchval(
+                f"SELECT {TASK_UPDATE_PAYLOAD.format(row='t')} FROM generation_tasks t WHERE t.id = $1",
+                task_id
+            )
+
+    async def listen(self, channel: str, callback: Callable,
+                     on_reconnect: Callable[[], Awaitable[None]] = None) -> NotificationListener:
+        """
+        Open a dedicated connection that calls callback(connection, pid,
+        channel, payload) for every notification on channel, reconnecting
+        if it is lost. LISTEN needs a session of its own, so this bypasses
+        the pool (and must not go through a transaction-mode pooler).
+        Close the returned listener to stop.
+        """
+        listener = NotificationListener(self.dsn, channel, callback, on_reconnect)
+        await listener.start()
+        return listener
+
+    async def close(self):
+        """Detach from the shared pool; close_all_pools() closes it"""
+        self.pool = None
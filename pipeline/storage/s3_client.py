@@ -0,0 +1,150 @@
+import aioboto3
+import asyncio
+import os
+from botocore.exceptions import ClientError
+from contextlib import AsyncExitStack
+from typing import Dict, List
+
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_CONCURRENCY = 8
+
+
+class PendingUpload:
+    """A multipart upload with all of its parts sent, to be completed or aborted"""
+
+    def __init__(self, s3_client: "S3Client", key: str, upload_id: str, parts: List[Dict]):
+        self.s3_client = s3_client
+        self.key = key
+        self.upload_id = upload_id
+        self.parts = parts
+
+    async def complete(self) -> str:
+        """Publish the object and return its URL"""
+        await self.s3_client.client.complete_multipart_upload(
+            Bucket=self.s3_client.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts}
+        )
+        return self.s3_client.object_url(self.key)
+
+    async def abort(self):
+        """Discard the uploaded parts"""
+        await self.s3_client.abort_multipart_upload(self.key, self.upload_id)
+
+
+class S3Client:
+    def __init__(self):
+        self.client = None
+        self._exit_stack = AsyncExitStack()
+        self.bucket = os.getenv("S3_BUCKET_NAME", "education-videos")
+        self.region = os.getenv("S3_REGION", "us-west-2")
+
+    async def initialize(self):
+        """Initialize S3 client"""
+        session = aioboto3.Session()
+        self.client = await self._exit_stack.enter_async_context(
+            session.client("s3", region_name=self.region)
+        )
+
+    def object_url(self, key: str) -> str:
+        """Public URL of an object, whether or not it has been uploaded yet"""
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    async def object_exists(self, key: str) -> bool:
+        """Check whether an object exists without downloading it"""
+        try:
+            await self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def copy_object(self, source_key: str, key: str) -> str:
+        """Copy an object within the bucket server-side and return the copy's URL"""
+        await self.client.copy_object(
+            Bucket=self.bucket, Key=key,
+            CopySource={"Bucket": self.bucket, "Key": source_key}
+        )
+        return self.object_url(key)
+
+    async def create_multipart_upload(self, key: str) -> str:
+        """Start a multipart upload and return its id"""
+        upload = await self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, ContentType="video/mp4"
+        )
+        return upload["UploadId"]
+
+    async def abort_multipart_upload(self, key: str, upload_id: str):
+        """Abort a multipart upload, discarding any parts sent"""
+        await self.client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+
+    async def upload_stream(
+            self,
+            reader: asyncio.StreamReader,
+            key: str,
+            part_size: int = DEFAULT_PART_SIZE,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            upload_id: str = None
+    ) -> PendingUpload:
+        """
+        Upload a stream (e.g. an encoder's stdout) as a multipart upload,
+        sending each part as soon as it is filled. Only the parts in
+        flight are held in memory, so botocore can retry them.
+
+        The upload is left open once the stream ends: the caller completes
+        it after checking that the producer succeeded, or aborts it.
+
+        Pass upload_id to continue an upload started ahead of time with
+        create_multipart_upload().
+        """
+        if upload_id is None:
+            upload_id = await self.create_multipart_upload(key)
+        semaphore = asyncio.Semaphore(concurrency)
+        uploads = []
+
+        async def _upload_part(part_number: int, body: bytes) -> Dict:
+            try:
+                response = await self.client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    PartNumber=part_number, Body=body
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            finally:
+                semaphore.release()
+
+        try:
+            part_number = 1
+            while True:
+                # Wait for a free slot before buffering the next part
+                await semaphore.acquire()
+                try:
+                    body = await reader.readexactly(part_size)
+                    at_eof = False
+                except asyncio.IncompleteReadError as e:
+                    body = e.partial
+                    at_eof = True
+
+                # Every upload needs at least one part, even if empty
+                if body or part_number == 1:
+                    uploads.append(asyncio.create_task(_upload_part(part_number, body)))
+                else:
+                    semaphore.release()
+
+                if at_eof:
+                    break
+                part_number += 1
+
+            parts: List[Dict] = await asyncio.gather(*uploads)
+        except BaseException:
+            # Stop parts still in flight first, or they could land after the abort
+            for upload_task in uploads:
+                upload_task.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+            await self.abort_multipart_upload(key, upload_id)
+            raise
+
+        return PendingUpload(self, key, upload_id, parts)
+
+    async def close(self):
+        """Close S3 client"""
+        await self._exit_stack.aclose()
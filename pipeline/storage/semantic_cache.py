@@ -0,0 +1,73 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Cosine similarity needed to treat two concept names as the same concept
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+# Entries this similar to an updated concept are dropped on invalidation
+DEFAULT_INVALIDATION_THRESHOLD = 0.9
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class SemanticCache:
+    """
+    In-process cache keyed by text embeddings, so near-identical phrasings
+    ("derivative" / "derivatives") share one entry. Entries are
+    partitioned by domain and looked up by nearest cosine similarity.
+    """
+
+    def __init__(
+            self,
+            embed: Callable[[str], Awaitable[List[float]]],
+            similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+            invalidation_threshold: float = DEFAULT_INVALIDATION_THRESHOLD,
+            max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.invalidation_threshold = invalidation_threshold
+        self.max_entries = max_entries
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def _vector(self, text: str) -> np.ndarray:
+        """Embed text, reusing embeddings of strings seen before"""
+        vector = self._embeddings.get(text)
+        if vector is None:
+            vector = np.asarray(await self.embed(text), dtype=np.float32)
+            vector /= np.linalg.norm(vector)
+            self._embeddings[text] = vector
+            if len(self._embeddings) > self.max_entries:
+                self._embeddings.popitem(last=False)
+        return vector
+
+    def _similarities(self, domain: str, vector: np.ndarray) -> np.ndarray:
+        entries = self._entries.get(domain, [])
+        if not entries:
+            return np.empty(0, dtype=np.float32)
+        return np.stack([entry["vector"] for entry in entries]) @ vector
+
+    async def get(self, text: str, domain: str) -> Optional[Any]:
+        """Return the payload of the most similar entry, if similar enough"""
+        similarities = self._similarities(domain, await self._vector(text))
+        if not similarities.size:
+            return None
+        best = int(similarities.argmax())
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return self._entries[domain][best]["payload"]
+
+    async def set(self, text: str, domain: str, payload: Any):
+        """Store a payload under the embedding of text"""
+        entries = self._entries.setdefault(domain, [])
+        entries.append({"vector": await self._vector(text), "payload": payload})
+        if len(entries) > self.max_entries:
+            entries.pop(0)
+
+    async def invalidate(self, text: str, domain: str):
+        """Drop every entry within the invalidation radius of text"""
+        similarities = self._similarities(domain, await self._vector(text))
+        self._entries[domain] = [
+            entry for entry, similarity in zip(self._entries.get(domain, []), similarities)
+            if similarity < self.invalidation_threshold
+        ]